@@ -0,0 +1,217 @@
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+# Alarm sound shipped with the application
+ALARM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alarm.mp3')
+
+# PCM format the alarm is decoded to
+SAMPLE_RATE = 44100
+CHANNELS = 1
+
+# Fallback tone when the alarm file can't be decoded: frequency (Hz) and length (s)
+TONE_FREQUENCY = 1000
+TONE_DURATION = 1.0
+
+# Minimum time between two alarms started by separate triggers, in seconds
+RATE_LIMIT = 5.0
+
+# Volume per escalation level; the alarm starts at the first level
+VOLUME_LEVELS = (0.4, 0.7, 1.0)
+
+# Seconds an unacknowledged alarm sounds before moving to the next level
+ESCALATE_INTERVAL = 3.0
+
+_pcm_cache = {}
+_pcm_lock = threading.Lock()
+
+
+def tone(frequency=TONE_FREQUENCY, duration=TONE_DURATION, sample_rate=SAMPLE_RATE):
+    """Return a sine beep as int16 PCM"""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    return (np.sin(2 * np.pi * frequency * t) * 0.8 * 32767).astype(np.int16)
+
+
+def load_pcm(path=ALARM_FILE):
+    """Decode path to mono int16 PCM at SAMPLE_RATE, once per process.
+
+    Decoding needs the optional miniaudio package; without it, or when the
+    file is missing, a plain tone is used instead.
+    """
+    with _pcm_lock:
+        pcm = _pcm_cache.get(path)
+        if pcm is None:
+            try:
+                import miniaudio
+                decoded = miniaudio.decode_file(path, output_format=miniaudio.SampleFormat.SIGNED16,
+                                                nchannels=CHANNELS, sample_rate=SAMPLE_RATE)
+                pcm = np.frombuffer(decoded.samples, dtype=np.int16)
+            except Exception as e:
+                print(f"Error decoding alarm sound, using a tone instead: {str(e)}")
+                pcm = tone()
+            _pcm_cache[path] = pcm
+        return pcm
+
+
+class NullSink:
+    """Audio sink that plays nothing, for headless machines and tests.
+
+    Every call is recorded in `calls` as (action, volume).
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def play(self, pcm, volume):
+        self.calls.append(('play', volume))
+
+    def stop(self):
+        self.calls.append(('stop', None))
+
+
+class MiniaudioSink:
+    """Loop int16 PCM on the default output device through miniaudio"""
+
+    def __init__(self):
+        import miniaudio
+        self._miniaudio = miniaudio
+        self._device = None
+
+    def _stream(self, pcm, volume):
+        position = 0
+        frames = yield b''
+        while True:
+            chunk = np.take(pcm, np.arange(position, position + frames), mode='wrap')
+            position = (position + frames) % len(pcm)
+            frames = yield (chunk * volume).astype(np.int16).tobytes()
+
+    def play(self, pcm, volume):
+        self.stop()
+        miniaudio = self._miniaudio
+        self._device = miniaudio.PlaybackDevice(output_format=miniaudio.SampleFormat.SIGNED16,
+                                                nchannels=CHANNELS, sample_rate=SAMPLE_RATE)
+        stream = self._stream(pcm, volume)
+        next(stream)
+        self._device.start(stream)
+
+    def stop(self):
+        if self._device is not None:
+            self._device.close()
+            self._device = None
+
+
+def create_sink(name='auto'):
+    """Return the sink for name: 'audio', 'null', or 'auto' for audio when available"""
+    if name == 'null':
+        return NullSink()
+    try:
+        return MiniaudioSink()
+    except Exception as e:
+        if name == 'audio':
+            raise
+        print(f"Audio output unavailable, alarms will be silent: {str(e)}")
+        return NullSink()
+
+
+class AlarmService:
+    """Drowsiness alarm played on its own thread.
+
+    start(), stop() and escalate() only queue a command, so callers such as
+    the detection loop never wait on audio. A started alarm loops until
+    stopped, moving up one VOLUME_LEVELS step every escalate_interval
+    seconds. A start closer than rate_limit seconds to the previous one is
+    deferred until the limit has passed, and dropped if a stop arrives
+    first, so a flickering detector doesn't retrigger the alarm but a
+    driver who stays drowsy still hears it.
+    """
+
+    def __init__(self, sink=None, path=ALARM_FILE, rate_limit=RATE_LIMIT,
+                 escalate_interval=ESCALATE_INTERVAL):
+        self.sink = sink or create_sink()
+        self.path = path
+        self.rate_limit = rate_limit
+        self.escalate_interval = escalate_interval
+        self.level = None
+        self.started = 0
+        self.deferred = 0
+        self._last_start = None
+        self._commands = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def active(self):
+        return self.level is not None
+
+    def start(self):
+        self._commands.put('start')
+
+    def stop(self):
+        self._commands.put('stop')
+
+    def escalate(self):
+        self._commands.put('escalate')
+
+    def close(self):
+        self._commands.put(None)
+        self._thread.join()
+
+    def _play(self, pcm, level):
+        self.level = level
+        try:
+            self.sink.play(pcm, VOLUME_LEVELS[level])
+        except Exception as e:
+            print(f"Error playing alarm: {str(e)}")
+
+    def _silence(self):
+        self.level = None
+        try:
+            self.sink.stop()
+        except Exception as e:
+            print(f"Error stopping alarm: {str(e)}")
+
+    def _run(self):
+        # Decode once, off the caller's thread
+        pcm = load_pcm(self.path)
+        next_escalation = None
+        # When a rate-limited start is due, or None
+        pending_start = None
+        while True:
+            deadlines = [t for t in (next_escalation, pending_start) if t is not None]
+            timeout = max(min(deadlines) - time.monotonic(), 0.0) if deadlines else None
+            try:
+                command = self._commands.get(timeout=timeout)
+            except queue.Empty:
+                due = pending_start is not None and time.monotonic() >= pending_start
+                command = 'start' if due else 'escalate'
+
+            now = time.monotonic()
+            if command is None:
+                self._silence()
+                return
+            if command == 'start':
+                if self.active:
+                    continue
+                if self._last_start is not None and now - self._last_start < self.rate_limit:
+                    if pending_start is None:
+                        self.deferred += 1
+                        pending_start = self._last_start + self.rate_limit
+                    continue
+                pending_start = None
+                self._last_start = now
+                self.started += 1
+                self._play(pcm, 0)
+            elif command == 'escalate':
+                if not self.active:
+                    continue
+                if self.level + 1 < len(VOLUME_LEVELS):
+                    self._play(pcm, self.level + 1)
+            elif command == 'stop':
+                pending_start = None
+                if self.active:
+                    self._silence()
+
+            at_top = self.level is None or self.level + 1 >= len(VOLUME_LEVELS)
+            next_escalation = None if at_top else now + self.escalate_interval
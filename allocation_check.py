@@ -0,0 +1,61 @@
+import argparse
+import sys
+import tracemalloc
+import cv2
+import numpy as np
+from modules.drowsiness_detector import DrowsinessDetector
+from modules.inference_backends import StubBackend
+from modules.detection_benchmark import synthetic_frame
+
+# Largest steady-state Python-side allocation allowed per frame, in bytes.
+# A single freshly allocated 640x480 grayscale copy is already 300 KiB.
+ALLOCATION_BOUND = 32 * 1024
+
+# Frames run before measuring, so every buffer has been sized
+WARMUP_FRAMES = 20
+
+
+def measure_allocations(detector, model, frame, eye_boxes, frames=200, warmup=WARMUP_FRAMES):
+    """Return per-frame peaks of traced allocations, in bytes, above the frame's starting level.
+
+    Each frame runs the face/eye cascades and, so the eye path is always
+    exercised, preprocesses and classifies the crops at eye_boxes.
+    """
+    source = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if model.input_shape[2] == 1 else frame
+    crops = [source[y:y + h, x:x + w] for (x, y, w, h) in eye_boxes]
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(warmup + frames):
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            detector.detect_faces(model, frame)
+            detector.classify_eyes(model, detector.batch_eyes(crops, model.input_shape, source))
+            _, peak = tracemalloc.get_traced_memory()
+            if i >= warmup:
+                peaks.append(peak - start)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check steady-state per-frame allocations of the detector")
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--bound', type=int, default=ALLOCATION_BOUND, help="Allowed bytes per frame")
+    args = parser.parse_args()
+
+    model = StubBackend()
+    detector = DrowsinessDetector(None, backend='stub', tracking=False)
+    frame, eye_boxes = synthetic_frame()
+    peaks = measure_allocations(detector, model, frame, eye_boxes, args.frames)
+    worst = max(peaks)
+    print(f"Per-frame allocation peak: median {int(np.median(peaks))} B, max {worst} B, bound {args.bound} B")
+    if worst > args.bound:
+        print("FAIL: steady-state allocations exceed the bound")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
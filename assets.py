@@ -0,0 +1,112 @@
+import os
+import threading
+from modules.model_files import MODEL_FILES
+
+# Environment variable with extra asset directories, searched first (os.pathsep separated)
+ASSET_PATH_ENV = 'DDMS_ASSET_PATH'
+
+# Haar cascades used by the detector, by role
+CASCADE_FILES = {
+    'face': 'haarcascade_frontalface_default.xml',
+    'left_eye': 'haarcascade_lefteye_2splits.xml',
+    'right_eye': 'haarcascade_righteye_2splits.xml'
+}
+
+
+class AssetError(Exception):
+    """A required model or cascade file is missing or unusable"""
+    pass
+
+
+def default_search_path():
+    """Asset directories: $DDMS_ASSET_PATH, then the application directory"""
+    extra = os.environ.get(ASSET_PATH_ENV, '')
+    directories = [d for d in extra.split(os.pathsep) if d]
+    directories.append(os.path.dirname(os.path.abspath(__file__)))
+    return directories
+
+
+class SharedCascade:
+    """CascadeClassifier shared by every detector in the process.
+
+    OpenCV does not guarantee detectMultiScale is safe to call on one
+    classifier from several threads at once, so calls are serialized.
+    """
+
+    def __init__(self, path):
+        import cv2
+        self.path = path
+        self._classifier = cv2.CascadeClassifier(path)
+        self._lock = threading.Lock()
+
+    def empty(self):
+        return self._classifier.empty()
+
+    def detectMultiScale(self, image, *args, **kwargs):
+        with self._lock:
+            return self._classifier.detectMultiScale(image, *args, **kwargs)
+
+
+class AssetManager:
+    """Resolve the model and cascade files from a search path and load cascades once.
+
+    The first directory containing a file wins. Use default() for the
+    process-wide instance so every detector shares the parsed classifiers.
+    """
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, search_path=None):
+        self.search_path = list(search_path) if search_path is not None else default_search_path()
+        self._cascades = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, search_path):
+        """Replace the process-wide instance with one searching search_path"""
+        with cls._default_lock:
+            cls._default = cls(search_path)
+            return cls._default
+
+    @classmethod
+    def default(cls):
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def find(self, filename):
+        """Return the path of filename in the search path, or None"""
+        for directory in self.search_path:
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def resolve(self, filename):
+        path = self.find(filename)
+        if path is None:
+            raise AssetError(f"{filename} not found in: {os.pathsep.join(self.search_path)}")
+        return path
+
+    def model_path(self, backend='keras'):
+        return self.resolve(MODEL_FILES[backend])
+
+    def missing(self, backend='keras'):
+        """Names of the required files that are not on the search path"""
+        required = [MODEL_FILES[backend]] + list(CASCADE_FILES.values())
+        return [filename for filename in required if self.find(filename) is None]
+
+    def cascades(self):
+        """Return {role: SharedCascade}, loading and validating them on first use"""
+        with self._lock:
+            if self._cascades is None:
+                cascades = {}
+                for role, filename in CASCADE_FILES.items():
+                    path = self.resolve(filename)
+                    cascade = SharedCascade(path)
+                    if cascade.empty():
+                        raise AssetError(f"Could not load cascade {path}")
+                    cascades[role] = cascade
+                self._cascades = cascades
+            return self._cascades
@@ -0,0 +1,102 @@
+import argparse
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
+import cv2
+import numpy as np
+from modules.drowsiness_detector import DrowsinessDetector
+from modules.inference_backends import BACKENDS
+from modules.model_files import default_model_path
+from modules.model_registry import ModelRegistry
+
+# Decoded frames buffered ahead of detection in each worker
+DECODE_AHEAD = 32
+
+# Fields of each completed drowsiness event, saved as the columns of 'events'
+EVENT_COLUMNS = ('start', 'duration', 'closure_ratio', 'score')
+
+
+def _decode(path, frame_queue):
+    """Decode every frame of path into frame_queue, then a None sentinel"""
+    cap = cv2.VideoCapture(path)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_queue.put(frame)
+    finally:
+        cap.release()
+        frame_queue.put(None)
+
+
+def analyze_file(path, output_dir, model_path, backend):
+    """Run the full detection pipeline over one video file as fast as it decodes"""
+    cv2.setNumThreads(1)
+    model = ModelRegistry.get(model_path, backend)
+    detector = DrowsinessDetector(model_path, backend)
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+
+    frame_queue = queue.Queue(maxsize=DECODE_AHEAD)
+    decoder = threading.Thread(target=_decode, args=(path, frame_queue), daemon=True)
+    decoder.start()
+
+    # Episodes come from the same eye-state machine as live detection, on video time
+    scores = []
+    start = time.perf_counter()
+    while True:
+        frame = frame_queue.get()
+        if frame is None:
+            break
+        score = detector.detect_frame(model, frame)
+        detector.update_state(score, len(scores) / fps)
+        scores.append(np.nan if score is None else score)
+    detector.finish_episode(len(scores) / fps)
+    elapsed = time.perf_counter() - start
+    decoder.join()
+
+    scores = np.asarray(scores, dtype=np.float32)
+    events = np.array([[event[column] for column in EVENT_COLUMNS] for event in detector.completed_events],
+                      dtype=np.float64).reshape(-1, len(EVENT_COLUMNS))
+    name = os.path.splitext(os.path.basename(path))[0]
+    output_path = os.path.join(output_dir, f"{name}.npz")
+    np.savez_compressed(output_path, source=path, fps=fps, scores=scores, events=events,
+                        event_columns=np.array(EVENT_COLUMNS))
+    return {
+        'source': path,
+        'output': output_path,
+        'frames': int(len(scores)),
+        'episodes': int(len(events)),
+        'fps': len(scores) / elapsed if elapsed else 0.0
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline drowsiness analysis of recorded video files")
+    parser.add_argument('videos', nargs='+', help="Video files to analyze")
+    parser.add_argument('--output-dir', default='analysis', help="Directory for the per-file .npz results")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='keras')
+    parser.add_argument('--model', help="Model file (defaults to the backend's model)")
+    parser.add_argument('--processes', type=int, help="Number of parallel worker processes (defaults to CPU count)")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    model_path = args.model or default_model_path(args.backend)
+    processes = max(1, min(len(args.videos), args.processes or os.cpu_count() or 1))
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=mp.get_context('spawn')) as pool:
+        futures = {pool.submit(analyze_file, path, args.output_dir, model_path, args.backend): path
+                   for path in args.videos}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+                print(f"{result['source']}: {result['frames']} frames, {result['episodes']} episodes, "
+                      f"{result['fps']:.1f} FPS -> {result['output']}")
+            except Exception as e:
+                print(f"Error analyzing {futures[future]}: {str(e)}")
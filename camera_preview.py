@@ -0,0 +1,92 @@
+import threading
+import time
+import tkinter as tk
+import cv2
+import numpy as np
+
+# Frames per second drawn in the dashboard, independent of the detection rate
+DISPLAY_FPS = 15
+
+# Size of the preview image in the dashboard
+PREVIEW_SIZE = (480, 360)
+
+# Overlay colours (BGR)
+FACE_COLOR = (0, 200, 0)
+OPEN_EYE_COLOR = (0, 200, 0)
+CLOSED_EYE_COLOR = (0, 0, 230)
+TEXT_COLOR = (255, 255, 255)
+
+
+class CameraPreview:
+    """Live camera preview with a detection overlay for a Tk label.
+
+    The detection thread calls submit() with every processed frame. At most
+    display_fps frames a second are drawn: the frame is resized into a
+    reused buffer, annotated, converted to RGB once and encoded as a PPM
+    image. A root.after loop on the Tk thread picks up the newest image and
+    loads it into a single PhotoImage, so Tk never waits on detection.
+    """
+
+    def __init__(self, root, label, display_fps=DISPLAY_FPS, size=PREVIEW_SIZE):
+        self.root = root
+        self.label = label
+        self.interval = 1.0 / display_fps
+        self.width, self.height = size
+        self.photo = tk.PhotoImage(width=self.width, height=self.height)
+        self.label.config(image=self.photo)
+        self._header = f"P6 {self.width} {self.height} 255 ".encode('ascii')
+        self._bgr = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._rgb = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._latest = None
+        self._last_draw = 0.0
+        self._lock = threading.Lock()
+        self._running = False
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._refresh()
+
+    def stop(self):
+        self._running = False
+        with self._lock:
+            self._latest = None
+        self.photo.blank()
+
+    def submit(self, frame, faces, score, count):
+        """Queue frame for display; called from the detection thread.
+
+        faces is the detect_faces() result for frame, score the driver's
+        closed-eye score (or None) and count the current drowsiness counter.
+        """
+        now = time.perf_counter()
+        if not self._running or now - self._last_draw < self.interval:
+            return
+        self._last_draw = now
+
+        frame_height, frame_width = frame.shape[:2]
+        fx, fy = self.width / frame_width, self.height / frame_height
+        canvas = self._bgr
+        cv2.resize(frame, (self.width, self.height), dst=canvas, interpolation=cv2.INTER_AREA)
+        for (x, y, w, h), eye_boxes, eye_scores in faces:
+            cv2.rectangle(canvas, (int(x * fx), int(y * fy)), (int((x + w) * fx), int((y + h) * fy)), FACE_COLOR, 2)
+            for (ex, ey, ew, eh), eye_score in zip(eye_boxes, eye_scores):
+                color = CLOSED_EYE_COLOR if eye_score > 0.5 else OPEN_EYE_COLOR
+                cv2.rectangle(canvas, (int(ex * fx), int(ey * fy)), (int((ex + ew) * fx), int((ey + eh) * fy)), color, 1)
+        status = f"Closed: {score:.2f}" if score is not None else "No eyes"
+        cv2.putText(canvas, f"{status}   Drowsiness: {count}", (10, 25),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, TEXT_COLOR, 2)
+        cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        image = self._header + self._rgb.tobytes()
+        with self._lock:
+            self._latest = image
+
+    def _refresh(self):
+        if not self._running:
+            return
+        with self._lock:
+            image, self._latest = self._latest, None
+        if image is not None:
+            # Reload the existing PhotoImage instead of creating a new one per frame
+            self.photo.configure(data=image, format='PPM')
+        self.root.after(int(self.interval * 1000), self._refresh)
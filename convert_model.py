@@ -0,0 +1,30 @@
+import argparse
+import os
+from modules.inference_backends import KerasBackend, TFLiteBackend, convert_to_tflite, check_parity
+from modules.model_files import default_model_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert drowsiness_model.h5 to a TFLite model")
+    parser.add_argument('--input', default=default_model_path('keras'), help="Keras .h5 model")
+    parser.add_argument('--output', default=default_model_path('tflite'), help="TFLite model to write")
+    parser.add_argument('--check', action='store_true', help="Verify that both backends give the same predictions")
+    parser.add_argument('--samples', type=int, default=64, help="Number of eye crops used by --check")
+    parser.add_argument('--eyes', help="Directory of labelled eye crops (Closed/Open) for --check; "
+                                       "drawn eye crops are used without it")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.output):
+        convert_to_tflite(args.input, args.output)
+        print(f"Wrote {args.output}")
+    else:
+        print(f"{args.output} already exists, skipping conversion")
+
+    if args.check:
+        reference = KerasBackend(args.input)
+        batch = None
+        if args.eyes:
+            from modules.quantize_model import load_eye_dataset
+            batch, _ = load_eye_dataset(args.eyes, reference.input_shape, args.samples)
+        max_diff = check_parity(reference, TFLiteBackend(args.output), samples=args.samples, batch=batch)
+        print(f"Parity OK: max probability difference {max_diff:.6f} over "
+              f"{args.samples if batch is None else len(batch)} samples")
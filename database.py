@@ -1,28 +1,61 @@
+import threading
 import mysql.connector
-from tkinter import messagebox
+from mysql.connector import pooling
+from modules.storage import JOURNEY_INDEXES, STAT_COLUMNS
+
+DB_CONFIG = {
+    'host': "localhost",
+    'user': "root",
+    'password': "",
+    'database': "drowsiness_db"
+}
+
+# Default number of pooled MySQL connections
+POOL_SIZE = 5
+
 
 class DatabaseManager:
-    @staticmethod
-    def get_connection():
-        try:
-            connection = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="drowsiness_db"
-            )
-            return connection
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error connecting to database: {e}")
-            return None
+    _pool = None
+    _pool_size = POOL_SIZE
+    _pool_lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, pool_size=POOL_SIZE):
+        """Set the connection pool size; takes effect before the first connection"""
+        with cls._pool_lock:
+            cls._pool_size = pool_size
+            cls._pool = None
+
+    @classmethod
+    def _get_pool(cls):
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = pooling.MySQLConnectionPool(pool_name="drowsiness_pool",
+                                                        pool_size=cls._pool_size,
+                                                        pool_reset_session=False,
+                                                        **DB_CONFIG)
+            return cls._pool
+
+    @classmethod
+    def get_connection(cls):
+        """Return a pooled connection; close() hands it back to the pool.
+
+        mysql.connector.Error propagates to the caller.
+        """
+        return cls._get_pool().get_connection()
 
     @staticmethod
     def create_database():
+        """Create the database, tables and indexes, migrating older schemas.
+
+        Runs off the Tk thread from MySQLStorage; errors are raised to the caller.
+        """
+        connection = None
         try:
             connection = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password=""
+                host=DB_CONFIG['host'],
+                user=DB_CONFIG['user'],
+                password=DB_CONFIG['password']
             )
             cursor = connection.cursor()
 
@@ -40,7 +73,9 @@ class DatabaseManager:
                 place VARCHAR(100),
                 phone VARCHAR(20),
                 username VARCHAR(50) UNIQUE,
-                password VARCHAR(100)
+                password VARCHAR(100),
+                updated_at DATETIME(6),
+                INDEX idx_drivers_updated_at (updated_at)
             )''')
 
             # Create journeys table
@@ -51,9 +86,55 @@ class DatabaseManager:
                 end_time DATETIME,
                 drowsiness_count INT,
                 journey_status VARCHAR(50),
+                updated_at DATETIME(6),
                 FOREIGN KEY (driver_id) REFERENCES drivers(id)
             )''')
 
+            # Tables created before incremental refresh lack updated_at
+            for table in ('drivers', 'journeys'):
+                cursor.execute("""
+                    SELECT COUNT(*) FROM information_schema.columns
+                    WHERE table_schema = DATABASE() AND table_name = %s AND column_name = 'updated_at'
+                """, (table,))
+                if not cursor.fetchone()[0]:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME(6), ADD INDEX idx_{table}_updated_at (updated_at)")
+
+            # Deletion log read by incremental admin refreshes
+            cursor.execute('''CREATE TABLE IF NOT EXISTS deleted_rows (
+                table_name VARCHAR(20),
+                row_id INT,
+                deleted_at DATETIME(6),
+                INDEX idx_deleted_rows_time (deleted_at)
+            )''')
+
+            # Create per-event drowsiness log
+            cursor.execute('''CREATE TABLE IF NOT EXISTS drowsiness_events (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                journey_id INT NOT NULL,
+                event_time DATETIME(3),
+                duration FLOAT,
+                eye_closure_ratio FLOAT,
+                model_score FLOAT,
+                INDEX idx_events_journey_time (journey_id, event_time),
+                FOREIGN KEY (journey_id) REFERENCES journeys(id) ON DELETE CASCADE
+            )''')
+
+            # Add journey indexes used by the admin views, also on existing tables
+            for index_name, columns in JOURNEY_INDEXES.items():
+                cursor.execute("""
+                    SELECT COUNT(*) FROM information_schema.statistics
+                    WHERE table_schema = DATABASE() AND table_name = 'journeys' AND index_name = %s
+                """, (index_name,))
+                if not cursor.fetchone()[0]:
+                    cursor.execute(f"CREATE INDEX {index_name} ON journeys ({', '.join(columns)})")
+
+            # Summary tables maintained incrementally by every write
+            counters = ''.join(f", {c} {'DOUBLE' if c == 'driving_seconds' else 'INT'} NOT NULL DEFAULT 0"
+                               for c in STAT_COLUMNS)
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS fleet_stats (id INT PRIMARY KEY, drivers INT NOT NULL DEFAULT 0{counters})")
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS driver_stats (driver_id INT PRIMARY KEY{counters})")
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS daily_stats (day DATE PRIMARY KEY{counters})")
+
             # Add admin table
             cursor.execute('''CREATE TABLE IF NOT EXISTS admins (
                 id INT AUTO_INCREMENT PRIMARY KEY,
@@ -67,9 +148,8 @@ class DatabaseManager:
                 cursor.execute("INSERT INTO admins (username, password) VALUES ('admin', 'admin123')")
 
             connection.commit()
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error creating database: {e}")
         finally:
-            if connection.is_connected():
+            if connection is not None and connection.is_connected():
                 cursor.close()
-                connection.close()
\ No newline at end of file
+                connection.close()
+
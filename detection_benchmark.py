@@ -0,0 +1,335 @@
+import argparse
+import json
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from modules.drowsiness_detector import DrowsinessDetector
+from modules.inference_backends import BACKENDS, StubBackend, create_backend
+
+# Frames in the synthetic fixture and their size
+SYNTHETIC_FRAMES = 300
+FRAME_SIZE = (640, 480)
+
+# Synthetic eyes are closed for this many frames out of every cycle
+EYE_CYCLE = 90
+EYES_CLOSED = 30
+
+# Frames run before timing starts
+WARMUP_FRAMES = 10
+
+# Synthetic recording shipped with the benchmark: synthetic_clip's drawn face
+# encoded as MJPG, not camera footage. Its eye boxes come from the generator
+# in a .eyes.json sidecar rather than from the eye cascades; regenerate both
+# with --make-fixture
+FIXTURE_CLIP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'synthetic_driver.avi')
+FIXTURE_FRAMES = 60
+FIXTURE_SIZE = (320, 240)
+FIXTURE_FPS = 30.0
+
+# Blur kernel standing in for camera optics; also keeps the recorded noise compressible
+FIXTURE_BLUR = (5, 5)
+
+# Relative slowdown against the baseline reported as a regression
+REGRESSION_TOLERANCE = 0.10
+
+# Metrics compared against a baseline, and whether higher values are better
+COMPARED_METRICS = {
+    'fps': True,
+    'latency_p50_ms': False,
+    'latency_p99_ms': False,
+    'face_cascade_ms': False,
+    'eye_cascade_ms': False,
+    'preprocess_ms': False,
+    'classifier_ms': False
+}
+
+
+def synthetic_frame(width=FRAME_SIZE[0], height=FRAME_SIZE[1], seed=0, offset=(0, 0), closed=False):
+    """A noisy BGR frame with a bright face-like ellipse and two eyes.
+
+    Returns the frame and the (x, y, w, h) boxes around the eyes.
+    """
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(40, 90, (height, width, 3), dtype=np.uint8)
+    center = (width // 2 + offset[0], height // 2 + offset[1])
+    cv2.ellipse(frame, center, (width // 6, height // 4), 0, 0, 360, (170, 185, 210), -1)
+    eyes = []
+    for dx in (-width // 16, width // 16):
+        x, y = center[0] + dx, center[1] - height // 12
+        if closed:
+            cv2.line(frame, (x - 18, y), (x + 18, y), (30, 30, 30), 2)
+        else:
+            cv2.ellipse(frame, (x, y), (18, 9), 0, 0, 360, (245, 245, 245), -1)
+            cv2.circle(frame, (x, y), 7, (30, 30, 30), -1)
+        eyes.append((x - 24, y - 16, 48, 32))
+    return frame, eyes
+
+
+def synthetic_clip(count=SYNTHETIC_FRAMES, size=FRAME_SIZE):
+    """Frames of a slowly swaying synthetic face that closes its eyes periodically.
+
+    Returns the frames and the eye boxes of every frame.
+    """
+    frames = []
+    eye_boxes = []
+    for i in range(count):
+        offset = (int(12 * np.sin(i / 15.0)), int(6 * np.cos(i / 20.0)))
+        frame, eyes = synthetic_frame(size[0], size[1], seed=i, offset=offset,
+                                      closed=(i % EYE_CYCLE) < EYES_CLOSED)
+        frames.append(frame)
+        eye_boxes.append(eyes)
+    return frames, eye_boxes
+
+
+def _eye_box_path(path):
+    return os.path.splitext(path)[0] + '.eyes.json'
+
+
+def write_fixture(path=FIXTURE_CLIP, count=FIXTURE_FRAMES, size=FIXTURE_SIZE, fps=FIXTURE_FPS):
+    """Encode a synthetic clip, slightly blurred, as MJPG video with the generator's eye boxes alongside"""
+    frames, eye_boxes = synthetic_clip(count, size)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not write {path}")
+    try:
+        for frame in frames:
+            writer.write(cv2.GaussianBlur(frame, FIXTURE_BLUR, 0))
+    finally:
+        writer.release()
+    with open(_eye_box_path(path), 'w') as f:
+        json.dump(eye_boxes, f)
+
+
+def recorded_clip(path, limit=None):
+    """Decode a video clip into memory so decoding isn't timed.
+
+    Returns the frames and, when the clip has a .eyes.json sidecar, the eye
+    boxes of every frame (else None). Only write_fixture produces sidecars;
+    real footage has none and relies on the eye cascades alone.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open {path}")
+    frames = []
+    try:
+        while limit is None or len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+    if not frames:
+        raise RuntimeError(f"No frames in {path}")
+    eye_boxes = None
+    if os.path.exists(_eye_box_path(path)):
+        with open(_eye_box_path(path)) as f:
+            eye_boxes = [[tuple(box) for box in boxes] for boxes in json.load(f)[:len(frames)]]
+    return frames, eye_boxes
+
+
+class _Timer:
+    """Accumulate the durations of calls made during the current frame"""
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.samples = []
+
+    def time(self, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    def end_frame(self, keep):
+        if keep:
+            self.samples.append(self.elapsed)
+        self.elapsed = 0.0
+
+
+class _TimedCascade:
+    def __init__(self, cascade, timer):
+        self.cascade = cascade
+        self.timer = timer
+
+    def empty(self):
+        return self.cascade.empty()
+
+    def detectMultiScale(self, *args, **kwargs):
+        return self.timer.time(self.cascade.detectMultiScale, *args, **kwargs)
+
+
+class _TimedModel:
+    def __init__(self, model, timer):
+        self.model = model
+        self.input_shape = model.input_shape
+        self.timer = timer
+
+    def predict(self, batch):
+        return self.timer.time(self.model.predict, batch)
+
+
+def _percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000.0) if samples else 0.0
+
+
+def run_benchmark(frames, model, tracking=True, warmup=WARMUP_FRAMES, eye_boxes=None):
+    """Time the detection pipeline over frames; returns a JSON-ready result dict.
+
+    The eye cascades rarely fire on drawn eyes, so with eye_boxes (the known
+    boxes of every frame) a frame where no eyes are found is classified at
+    those boxes instead; preprocessing and the classifier are then always
+    timed. Raises RuntimeError when the face cascade finds no faces at all,
+    as the per-stage timings would not describe the real pipeline.
+    """
+    timers = {name: _Timer() for name in ('face_cascade', 'eye_cascade', 'preprocess', 'classifier')}
+    detector = DrowsinessDetector(None, backend=getattr(model, 'name', None), tracking=tracking)
+    detector.tracker.face_cascade = _TimedCascade(detector.face_cascade, timers['face_cascade'])
+    detector.left_eye_cascade = _TimedCascade(detector.left_eye_cascade, timers['eye_cascade'])
+    detector.right_eye_cascade = _TimedCascade(detector.right_eye_cascade, timers['eye_cascade'])
+    batch_eyes = detector.batch_eyes
+    detector.batch_eyes = lambda *args: timers['preprocess'].time(batch_eyes, *args)
+    timed_model = _TimedModel(model, timers['classifier'])
+
+    latencies = []
+    faces_found = 0
+    eyes_found = 0
+    known_eye_frames = 0
+    total = 0.0
+    gray = None
+    for i in range(warmup + len(frames)):
+        frame = frames[i % len(frames)]
+        timestamp = i / 30.0
+        start = time.perf_counter()
+        faces = detector.detect_faces(timed_model, frame)
+        detected = len(faces)
+        known = eye_boxes is not None and not any(len(boxes) for _, boxes, _ in faces)
+        if known:
+            boxes = eye_boxes[i % len(frames)]
+            if gray is None or gray.shape != frame.shape[:2]:
+                gray = np.empty(frame.shape[:2], dtype=np.uint8)
+            source = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray) if model.input_shape[2] == 1 else frame
+            crops = [source[y:y + h, x:x + w] for (x, y, w, h) in boxes]
+            scores = detector.classify_eyes(timed_model, detector.batch_eyes(crops, model.input_shape, source))
+            face_box = faces[0][0] if faces else (0, 0, frame.shape[1], frame.shape[0])
+            faces = [(face_box, boxes, scores)]
+        detector.update_state(detector.driver_score(faces), timestamp)
+        elapsed = time.perf_counter() - start
+
+        measured = i >= warmup
+        for timer in timers.values():
+            timer.end_frame(measured)
+        if measured:
+            latencies.append(elapsed)
+            total += elapsed
+            faces_found += detected
+            if known:
+                known_eye_frames += 1
+            else:
+                eyes_found += sum(len(boxes) for _, boxes, _ in faces)
+
+    result = {
+        'frames': len(latencies),
+        'fps': len(latencies) / total if total else 0.0,
+        'latency_p50_ms': _percentile_ms(latencies, 50),
+        'latency_p99_ms': _percentile_ms(latencies, 99),
+        'latency_mean_ms': float(np.mean(latencies) * 1000.0) if latencies else 0.0,
+        'faces_per_frame': faces_found / len(latencies) if latencies else 0.0,
+        'eyes_per_frame': eyes_found / len(latencies) if latencies else 0.0,
+        'known_eye_frames': known_eye_frames / len(latencies) if latencies else 0.0
+    }
+    if not faces_found:
+        raise RuntimeError("The face cascade found no faces; stage timings would only cover an empty pipeline")
+    for name, timer in timers.items():
+        result[f"{name}_ms"] = float(np.mean(timer.samples) * 1000.0) if timer.samples else 0.0
+        result[f"{name}_p99_ms"] = _percentile_ms(timer.samples, 99)
+    return result
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Return (fixture, metric, baseline, current, change) rows that regressed beyond tolerance"""
+    regressions = []
+    for fixture, current in results.items():
+        reference = baseline.get(fixture)
+        if reference is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = reference.get(metric), current.get(metric)
+            if old is None or new is None:
+                continue
+            if not old:
+                # A stage the baseline never ran now costs time; no relative change exists
+                if new and not higher_is_better:
+                    regressions.append((fixture, metric, old, new, float('inf')))
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append((fixture, metric, old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the drowsiness detection pipeline without a camera")
+    parser.add_argument('--video', action='append', default=[],
+                        help="Recorded clip to benchmark, in addition to the synthetic frames and recording (repeatable)")
+    parser.add_argument('--frames', type=int, default=SYNTHETIC_FRAMES,
+                        help="Synthetic frames, and the limit per recorded clip")
+    parser.add_argument('--backend', choices=sorted(BACKENDS) + ['stub'], default='stub',
+                        help="Classifier; stub needs no model file or ML runtime")
+    parser.add_argument('--model', help="Model file for non-stub backends")
+    parser.add_argument('--no-tracking', action='store_true', help="Run the full face cascade on every frame")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--compare', help="Baseline JSON to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help="Allowed relative slowdown before a metric is flagged")
+    parser.add_argument('--make-fixture', action='store_true', help="Regenerate the synthetic recording and exit")
+    args = parser.parse_args()
+
+    if args.make_fixture:
+        write_fixture()
+        print(f"Wrote {FIXTURE_CLIP}")
+        return
+
+    cv2.setNumThreads(1)
+    model = StubBackend() if args.backend == 'stub' else create_backend(args.backend, args.model)
+    fixtures = {'synthetic': synthetic_clip(args.frames)}
+    if os.path.exists(FIXTURE_CLIP):
+        fixtures['synthetic_recording'] = recorded_clip(FIXTURE_CLIP, args.frames)
+    for path in args.video:
+        fixtures[path] = recorded_clip(path, args.frames)
+
+    results = {}
+    for name, (frames, eye_boxes) in fixtures.items():
+        try:
+            results[name] = run_benchmark(frames, model, tracking=not args.no_tracking, eye_boxes=eye_boxes)
+        except RuntimeError as e:
+            print(f"ERROR {name}: {str(e)}")
+            sys.exit(1)
+        r = results[name]
+        print(f"{name}: {r['fps']:.1f} FPS, p50 {r['latency_p50_ms']:.2f} ms, p99 {r['latency_p99_ms']:.2f} ms "
+              f"(face {r['face_cascade_ms']:.2f}, eyes {r['eye_cascade_ms']:.2f}, "
+              f"preprocess {r['preprocess_ms']:.2f}, classifier {r['classifier_ms']:.2f} ms)")
+        if r['known_eye_frames']:
+            print(f"  eye boxes supplied by the generator on {r['known_eye_frames']:.0%} of frames")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for fixture, metric, old, new, change in regressions:
+            print(f"REGRESSION {fixture} {metric}: {old:.3f} -> {new:.3f} ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == '__main__':
+    main()
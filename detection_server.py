@@ -0,0 +1,182 @@
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+import cv2
+from modules.drowsiness_detector import DrowsinessDetector
+from modules.inference_backends import BACKENDS
+from modules.model_files import default_model_path
+from modules.model_registry import ModelRegistry
+
+# Seconds between per-stream FPS reports
+STATS_INTERVAL = 5.0
+
+
+def parse_source(source):
+    """Camera sources given as digits are device indices, anything else is a path/URL"""
+    return int(source) if str(source).isdigit() else source
+
+
+class _Stream:
+    """Capture and detector state for one source inside a worker process"""
+
+    def __init__(self, source_id, source, model_path, backend, realtime):
+        self.source_id = source_id
+        self.cap = cv2.VideoCapture(parse_source(source))
+        self.detector = DrowsinessDetector(model_path, backend)
+        self.realtime = realtime
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_period = 1.0 / self.fps if realtime and self.fps > 0 else 0.0
+        self.next_frame_at = time.perf_counter()
+        self.index = 0
+        self.frames = 0
+        self.window_start = time.perf_counter()
+
+    def ready(self):
+        return time.perf_counter() >= self.next_frame_at
+
+    def timestamp(self):
+        """Media time in seconds of the frame just read.
+
+        Uses the stream position where the source reports one, else the
+        frame count over the nominal frame rate, so episode timing follows
+        the video and not how fast it is processed.
+        """
+        position = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        if position > 0:
+            return position / 1000.0
+        if self.fps > 0:
+            return self.index / self.fps
+        return time.time()
+
+    def close(self):
+        self.cap.release()
+
+
+def _worker(assignments, model_path, backend, realtime, event_queue, stop_event):
+    """Worker process: run detection round-robin over the assigned sources"""
+    # One OpenCV thread per worker; parallelism comes from the processes
+    cv2.setNumThreads(1)
+    model = ModelRegistry.get(model_path, backend)
+    streams = []
+    for source_id, source in assignments:
+        stream = _Stream(source_id, source, model_path, backend, realtime)
+        if not stream.cap.isOpened():
+            event_queue.put({'type': 'error', 'source': source_id, 'message': f"Could not open {source}"})
+            continue
+        streams.append(stream)
+
+    try:
+        while streams and not stop_event.is_set():
+            idle = True
+            for stream in list(streams):
+                if not stream.ready():
+                    continue
+                idle = False
+                ret, frame = stream.cap.read()
+                if not ret:
+                    event_queue.put({'type': 'end', 'source': stream.source_id})
+                    stream.close()
+                    streams.remove(stream)
+                    continue
+                stream.next_frame_at += stream.frame_period
+
+                timestamp = stream.timestamp()
+                stream.index += 1
+                score = stream.detector.detect_frame(model, frame)
+                if stream.detector.update_state(score, timestamp):
+                    event_queue.put({'type': 'drowsy', 'source': stream.source_id,
+                                     'time': time.time(), 'media_time': timestamp, 'score': score})
+                while stream.detector.completed_events:
+                    event = stream.detector.completed_events.popleft()
+                    event_queue.put(dict(event, type='episode', source=stream.source_id))
+
+                stream.frames += 1
+                elapsed = time.perf_counter() - stream.window_start
+                if elapsed >= STATS_INTERVAL:
+                    event_queue.put({'type': 'stats', 'source': stream.source_id,
+                                     'fps': stream.frames / elapsed, 'pid': os.getpid()})
+                    stream.frames = 0
+                    stream.window_start = time.perf_counter()
+            if idle:
+                time.sleep(0.001)
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+class DetectionServer:
+    """Headless detection service running many video sources on a process pool.
+
+    Sources are spread round-robin over at most `processes` worker processes,
+    each source keeping its own DrowsinessDetector state. Drowsiness, stats,
+    end-of-stream and error events from every worker arrive on one queue.
+    """
+
+    def __init__(self, sources, model_path, backend='keras', processes=None, realtime=True):
+        self.sources = list(sources)
+        self.model_path = model_path
+        self.backend = backend
+        self.processes = max(1, min(len(self.sources), processes or os.cpu_count() or 1))
+        self.realtime = realtime
+        context = mp.get_context('spawn')
+        self.events = context.Queue()
+        self.stop_event = context.Event()
+        self._context = context
+        self._workers = []
+
+    def start(self):
+        assignments = [[] for _ in range(self.processes)]
+        for source_id, source in enumerate(self.sources):
+            assignments[source_id % self.processes].append((source_id, source))
+        for assigned in assignments:
+            worker = self._context.Process(target=_worker, daemon=True,
+                                           args=(assigned, self.model_path, self.backend, self.realtime,
+                                                 self.events, self.stop_event))
+            worker.start()
+            self._workers.append(worker)
+
+    def is_running(self):
+        return any(worker.is_alive() for worker in self._workers)
+
+    def iter_events(self, timeout=0.5):
+        """Yield events until every worker has finished"""
+        while True:
+            try:
+                yield self.events.get(timeout=timeout)
+            except queue.Empty:
+                if not self.is_running():
+                    return
+
+    def stop(self):
+        self.stop_event.set()
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless multi-camera drowsiness detection server")
+    parser.add_argument('sources', nargs='+', help="Camera indices, video files or stream URLs")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='keras')
+    parser.add_argument('--model', help="Model file (defaults to the backend's model)")
+    parser.add_argument('--processes', type=int, help="Number of worker processes (defaults to CPU count)")
+    parser.add_argument('--no-realtime', action='store_true', help="Process files as fast as possible")
+    args = parser.parse_args()
+
+    server = DetectionServer(args.sources, args.model or default_model_path(args.backend), args.backend,
+                             processes=args.processes, realtime=not args.no_realtime)
+    server.start()
+    try:
+        for event in server.iter_events():
+            if event['type'] == 'stats':
+                print(f"[{args.sources[event['source']]}] {event['fps']:.1f} FPS")
+            else:
+                print(f"[{args.sources[event['source']]}] {event}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
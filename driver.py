@@ -1,21 +1,25 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import mysql.connector
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-import cv2
 import threading
-import numpy as np
-from keras.models import load_model
-from keras.preprocessing.image import img_to_array
-from playsound import playsound
 import os
-from modules.database import DatabaseManager
-from modules.drowsiness_detector import DrowsinessDetector
-from modules.gui_styles import GUIStyles
+import bisect
+from modules.storage import create_storage, StorageError, WriteBehindQueue, EventBuffer, PAGE_SIZE
+from modules.assets import AssetManager, AssetError
+from modules.report import EXPORTERS, format_journey, summarize
+from modules.task_executor import TaskExecutor
+
+# The detector, camera preview and alarm pull in OpenCV and the ML runtime;
+# they are imported where first used, and warmed up after the first paint
+
+# Journeys shown per page of the report window
+REPORT_PAGE_ROWS = 50
 
 class DriverDrowsinessGUI:
-    def __init__(self, root):
+    def __init__(self, root, backend='keras', storage=None, alarm_sink='auto', warm_up=True):
         self.root = root
+        self.backend = backend
+        self.storage = storage or create_storage('mysql')
         self.root.title("Driver Drowsiness Management System")
         
         # Get screen width and height
@@ -29,7 +33,7 @@ class DriverDrowsinessGUI:
         self.root.resizable(True, True)
         
         # Set window state to zoomed (maximized)
-        self.root.state('zoomed')
+        self._maximize()
         
         # Set root background color
         self.root.configure(bg='#E8F0FE')  # Light blue-gray background
@@ -68,87 +72,73 @@ class DriverDrowsinessGUI:
         self.setup_admin_login_frame()
         self.setup_admin_frame()
         
+        # Database and model work runs off the Tk thread
+        self.tasks = TaskExecutor(self.root)
+        
+        # Alarm service, created with the first journey; alarm_sink is passed to create_sink
+        self.alarm_sink = alarm_sink
+        self.alarm = None
+        
+        # Detection-side writes go through a background writer
+        self.db_writer = WriteBehindQueue()
+        self.event_buffer = EventBuffer(self.db_writer, self.storage)
+        
         # Show login frame initially
         self.show_login_frame()
+        
+        # Paint the login window before the heavy imports start competing for the GIL,
+        # then load the detection stack while the driver is logging in
+        self.assets = AssetManager.default()
+        try:
+            self.model_path = self.assets.model_path(self.backend)
+        except AssetError:
+            self.model_path = None
+        self.root.update_idletasks()
+        # warm_up=False leaves both out, e.g. to measure the bare login window
+        if warm_up:
+            self.root.after_idle(self.check_assets)
+            self.root.after_idle(self.warm_up_detection)
+
+    def check_assets(self):
+        """Warn at startup when model or cascade files are missing from the asset path"""
+        missing = self.assets.missing(self.backend)
+        if missing:
+            messagebox.showwarning("Missing Files",
+                                   "Detection is unavailable until these files are installed:\n"
+                                   + "\n".join(missing)
+                                   + "\n\nSearched: " + os.pathsep.join(self.assets.search_path))
+
+    def warm_up_detection(self):
+        """Import OpenCV and the detector and load the model on a background thread"""
+        def worker():
+            try:
+                import modules.drowsiness_detector
+                import modules.camera_preview
+                # Parse and validate the cascades once, before the first journey needs them
+                self.assets.cascades()
+                if self.model_path is not None:
+                    from modules.model_registry import ModelRegistry
+                    ModelRegistry.get(self.model_path, self.backend)
+            except Exception as e:
+                print(f"Error preloading detection modules: {str(e)}")
+
+        threading.Thread(target=worker, daemon=True).start()
     
+    def _maximize(self):
+        try:
+            self.root.state('zoomed')
+        except tk.TclError:
+            # X11 has no zoomed state, only the window manager attribute
+            self.root.attributes('-zoomed', True)
+
     def _setup_window(self):
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
         self.root.geometry(f"{screen_width}x{screen_height}+0+0")
         self.root.resizable(True, True)
-        self.root.state('zoomed')
+        self._maximize()
         self.root.configure(bg=self.styles.COLORS['bg_main'])
 
-    def get_db_connection(self):
-        try:
-            connection = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",  # Default XAMPP password
-                database="drowsiness_db"
-            )
-            return connection
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error connecting to database: {e}")
-            return None
-    
-    def create_database(self):
-        try:
-            connection = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password=""
-            )
-            cursor = connection.cursor()
-
-            # Create database
-            cursor.execute("CREATE DATABASE IF NOT EXISTS drowsiness_db")
-            cursor.execute("USE drowsiness_db")
-
-            # Create drivers table
-            cursor.execute('''CREATE TABLE IF NOT EXISTS drivers (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100),
-                age INT,
-                gender VARCHAR(10),
-                license_no VARCHAR(50),
-                place VARCHAR(100),
-                phone VARCHAR(20),
-                username VARCHAR(50) UNIQUE,
-                password VARCHAR(100)
-            )''')
-
-            # Create journeys table
-            cursor.execute('''CREATE TABLE IF NOT EXISTS journeys (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                driver_id INT,
-                start_time DATETIME,
-                end_time DATETIME,
-                drowsiness_count INT,
-                journey_status VARCHAR(50),
-                FOREIGN KEY (driver_id) REFERENCES drivers(id)
-            )''')
-
-            # Add admin table
-            cursor.execute('''CREATE TABLE IF NOT EXISTS admins (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(50) UNIQUE,
-                password VARCHAR(100)
-            )''')
-
-            # Insert default admin if not exists
-            cursor.execute("SELECT * FROM admins WHERE username = 'admin'")
-            if not cursor.fetchone():
-                cursor.execute("INSERT INTO admins (username, password) VALUES ('admin', 'admin123')")
-
-            connection.commit()
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error creating database: {e}")
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
     def setup_login_frame(self):
         tk.Label(self.login_frame, text="New Driver must Register to Login", 
                 font=self.header_font,
@@ -225,6 +215,11 @@ class DriverDrowsinessGUI:
                 font=self.header_font,
                 bg='#F5F9FF').pack(pady=30)
         
+        # Live camera preview with the detection overlay while a journey runs
+        self.preview_label = tk.Label(self.main_frame, bg='#F5F9FF')
+        self.preview_label.pack(pady=10)
+        self.preview = None
+        
         # Create buttons for driver actions
         self.start_button = tk.Button(self.main_frame, text="Start Journey",
                                     command=self.start_journey,
@@ -317,6 +312,15 @@ class DriverDrowsinessGUI:
                  bg='#3498DB', fg='white',
                  activebackground='#2874A6',
                  activeforeground='white').pack(pady=20)
+
+        tk.Button(self.admin_frame, text="Fleet Report",
+                 command=lambda: self.show_report("Fleet Report", "All Drivers"),
+                 font=('Helvetica', 12, 'bold'),
+                 width=25,
+                 height=2,
+                 bg='#3498DB', fg='white',
+                 activebackground='#2874A6',
+                 activeforeground='white').pack(pady=10)
         
         # Create notebook for tabs
         notebook = ttk.Notebook(self.admin_frame)
@@ -337,6 +341,9 @@ class DriverDrowsinessGUI:
                  bg='#E74C3C', fg='white',
                  activebackground='#B03A2E',
                  activeforeground='white').pack(pady=5)
+        drivers_scroll = ttk.Scrollbar(drivers_frame, orient='vertical', command=self.drivers_tree.yview)
+        self.drivers_tree.configure(yscrollcommand=lambda first, last: self._on_tree_scroll('drivers', drivers_scroll, first, last))
+        drivers_scroll.pack(side='right', fill='y', pady=10)
         self.drivers_tree.pack(pady=10, padx=10, fill='both', expand=True)
         
         # Journeys tab
@@ -354,8 +361,16 @@ class DriverDrowsinessGUI:
                  bg='#E74C3C', fg='white',
                  activebackground='#B03A2E',
                  activeforeground='white').pack(pady=5)
+        journeys_scroll = ttk.Scrollbar(journeys_frame, orient='vertical', command=self.journeys_tree.yview)
+        self.journeys_tree.configure(yscrollcommand=lambda first, last: self._on_tree_scroll('journeys', journeys_scroll, first, last))
+        journeys_scroll.pack(side='right', fill='y', pady=10)
         self.journeys_tree.pack(pady=10, padx=10, fill='both', expand=True)
         
+        # Keyset pagination state per tree; the generation discards results
+        # of fetches started before the last reload
+        self.admin_pages = {}
+        self.admin_generation = 0
+        
         # Refresh and Logout buttons with increased size
         tk.Button(self.admin_frame, text="Refresh Data",
                  command=self.refresh_admin_data,
@@ -375,32 +390,145 @@ class DriverDrowsinessGUI:
                  activeforeground='white').pack(pady=20)
 
     def refresh_admin_data(self):
-        # Clear existing items
+        """Patch the admin trees with rows changed since the last refresh"""
+        if not self.admin_pages or self.admin_high_water_mark is None:
+            self.reload_admin_data()
+            return
+        
+        generation = self.admin_generation
+        self.tasks.submit(self.storage.changes_since, self.admin_high_water_mark,
+                          on_done=lambda changes: self._apply_admin_changes(generation, changes),
+                          on_error=self._task_error("Error loading data"))
+
+    def _apply_admin_changes(self, generation, changes):
+        if generation != self.admin_generation:
+            return
+        if changes['stale']:
+            # Deletions older than the mark are gone from the log
+            self.reload_admin_data()
+            return
+        self.admin_high_water_mark = changes['high_water_mark']
+        
+        for table_name, row_id in changes['deleted']:
+            row = self.admin_rows.get(table_name, {}).pop(row_id, None)
+            if row is not None:
+                self.admin_keys[table_name].remove(self._row_key(table_name, row))
+                self._admin_tree(table_name).delete(str(row_id))
+        for name in ('drivers', 'journeys'):
+            for row in changes[name]:
+                self._patch_row(name, tuple(row))
+
+    def _set_high_water_mark(self, generation, now):
+        if generation == self.admin_generation:
+            self.admin_high_water_mark = now
+
+    def reload_admin_data(self):
+        """Clear both trees and load their first pages"""
         for item in self.drivers_tree.get_children():
             self.drivers_tree.delete(item)
         for item in self.journeys_tree.get_children():
             self.journeys_tree.delete(item)
         
-        connection = self.get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            
-            # Refresh drivers
-            cursor.execute("SELECT id, name, age, gender, license_no, place, phone, username FROM drivers")
-            for row in cursor.fetchall():
-                self.drivers_tree.insert('', 'end', values=row)
-            
-            # Refresh journeys
-            cursor.execute("""
-                SELECT j.id, j.driver_id, j.start_time, j.end_time, j.drowsiness_count, j.journey_status 
-                FROM journeys j
-                ORDER BY j.start_time DESC
-            """)
-            for row in cursor.fetchall():
-                self.journeys_tree.insert('', 'end', values=row)
-            
-            cursor.close()
-            connection.close()
+        # Row cache keyed by id, plus the sorted keys used to place new rows
+        self.admin_rows = {'drivers': {}, 'journeys': {}}
+        self.admin_keys = {'drivers': [], 'journeys': []}
+        self.admin_generation += 1
+        
+        # The mark comes from the database clock, like the updated_at it is compared with
+        generation = self.admin_generation
+        self.admin_high_water_mark = None
+        self.tasks.submit(self.storage.current_time,
+                          on_done=lambda now: self._set_high_water_mark(generation, now),
+                          on_error=self._task_error("Error loading data"))
+        
+        # Only the first page is loaded; more rows are fetched as the admin scrolls
+        self.admin_pages = {name: {'after': None, 'done': False, 'pending': False}
+                            for name in ('drivers', 'journeys')}
+        self.load_next_page('drivers')
+        self.load_next_page('journeys')
+
+    def _admin_tree(self, name):
+        return self.drivers_tree if name == 'drivers' else self.journeys_tree
+
+    @staticmethod
+    def _row_key(name, row):
+        """Sort key of a row: id for drivers, (start_time, id) for journeys"""
+        return row[0] if name == 'drivers' else (row[2], row[0])
+
+    def _patch_row(self, name, row):
+        """Update a cached row in place, or insert it if it falls inside the loaded pages"""
+        tree = self._admin_tree(name)
+        rows = self.admin_rows[name]
+        if row[0] in rows:
+            if rows[row[0]] != row:
+                tree.item(str(row[0]), values=row)
+                rows[row[0]] = row
+            return
+        
+        key = self._row_key(name, row)
+        page = self.admin_pages[name]
+        if not page['done'] and (page['after'] is None or
+                                 (key > page['after'] if name == 'drivers' else key < page['after'])):
+            # Not loaded yet; the row will arrive with a later page
+            return
+        keys = self.admin_keys[name]
+        position = bisect.bisect_left(keys, key)
+        index = position if name == 'drivers' else len(keys) - position
+        keys.insert(position, key)
+        rows[row[0]] = row
+        tree.insert('', index, iid=str(row[0]), values=row)
+
+    def load_next_page(self, name):
+        """Fetch the next keyset page of rows for the drivers or journeys tree"""
+        page = self.admin_pages.get(name)
+        if page is None or page['done']:
+            return
+        page['pending'] = True
+        generation = self.admin_generation
+        fetch = self.storage.list_drivers if name == 'drivers' else self.storage.list_journeys
+        
+        def failed(e):
+            if generation == self.admin_generation:
+                page['done'] = True
+            self._task_error("Error loading data")(e)
+        
+        self.tasks.submit(fetch, page['after'],
+                          on_done=lambda rows: self._append_page(generation, name, rows),
+                          on_error=failed)
+
+    def _append_page(self, generation, name, rows):
+        """Append a fetched page of rows to the drivers or journeys tree"""
+        if generation != self.admin_generation:
+            return
+        page = self.admin_pages[name]
+        page['pending'] = False
+        tree = self._admin_tree(name)
+        cache = self.admin_rows[name]
+        keys = self.admin_keys[name]
+        for row in rows:
+            row = tuple(row)
+            if row[0] in cache:
+                continue
+            cache[row[0]] = row
+            bisect.insort(keys, self._row_key(name, row))
+            tree.insert('', 'end', iid=str(row[0]), values=row)
+        if rows:
+            page['after'] = self._row_key(name, rows[-1])
+        page['done'] = len(rows) < PAGE_SIZE
+
+    def _on_tree_scroll(self, name, scrollbar, first, last):
+        """Scrollbar callback that fetches the next page near the bottom of a tree"""
+        scrollbar.set(first, last)
+        page = self.admin_pages.get(name)
+        if page and not page['done'] and not page['pending'] and float(last) >= 0.9:
+            self.load_next_page(name)
+
+    def _task_error(self, message):
+        """on_error handler reporting a failed background task in a message box"""
+        def show(e):
+            title = "Database Error" if isinstance(e, StorageError) else "Error"
+            messagebox.showerror(title, f"{message}: {str(e)}")
+        return show
 
     def delete_driver(self):
         selected_item = self.drivers_tree.selection()
@@ -411,22 +539,13 @@ class DriverDrowsinessGUI:
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this driver and all their journeys?"):
             driver_id = self.drivers_tree.item(selected_item)['values'][0]
             
-            connection = self.get_db_connection()
-            if connection:
-                cursor = connection.cursor()
-                try:
-                    # Delete related journeys first
-                    cursor.execute("DELETE FROM journeys WHERE driver_id = %s", (driver_id,))
-                    # Then delete the driver
-                    cursor.execute("DELETE FROM drivers WHERE id = %s", (driver_id,))
-                    connection.commit()
-                    messagebox.showinfo("Success", "Driver and related journeys deleted successfully")
-                    self.refresh_admin_data()
-                except mysql.connector.Error as e:
-                    messagebox.showerror("Error", f"Failed to delete driver: {str(e)}")
-                finally:
-                    cursor.close()
-                    connection.close()
+            def deleted(_):
+                messagebox.showinfo("Success", "Driver and related journeys deleted successfully")
+                self.refresh_admin_data()
+            
+            # Related journeys and events are deleted with the driver
+            self.tasks.submit(self.storage.delete_driver, driver_id,
+                              on_done=deleted, on_error=self._task_error("Failed to delete driver"))
 
     def delete_journey(self):
         selected_item = self.journeys_tree.selection()
@@ -437,19 +556,12 @@ class DriverDrowsinessGUI:
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this journey?"):
             journey_id = self.journeys_tree.item(selected_item)['values'][0]
             
-            connection = self.get_db_connection()
-            if connection:
-                cursor = connection.cursor()
-                try:
-                    cursor.execute("DELETE FROM journeys WHERE id = %s", (journey_id,))
-                    connection.commit()
-                    messagebox.showinfo("Success", "Journey deleted successfully")
-                    self.refresh_admin_data()
-                except mysql.connector.Error as e:
-                    messagebox.showerror("Error", f"Failed to delete journey: {str(e)}")
-                finally:
-                    cursor.close()
-                    connection.close()
+            def deleted(_):
+                messagebox.showinfo("Success", "Journey deleted successfully")
+                self.refresh_admin_data()
+            
+            self.tasks.submit(self.storage.delete_journey, journey_id,
+                              on_done=deleted, on_error=self._task_error("Failed to delete journey"))
 
     def admin_logout(self):
         """Handle admin logout"""
@@ -515,43 +627,36 @@ class DriverDrowsinessGUI:
             messagebox.showerror("Error", "Please enter a valid phone number")
             return
         
-        connection = self.get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                # Check if username already exists
-                cursor.execute("SELECT * FROM drivers WHERE username = %s", (values['Username'],))
-                if cursor.fetchone():
-                    messagebox.showerror("Error", "Username already exists")
-                    return
-                
-                # Insert new driver
-                cursor.execute("""
-                    INSERT INTO drivers (name, age, gender, license_no, place, phone, username, password)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    values['Name'],
-                    age,
-                    values['Gender'],
-                    values['License No'],
-                    values['Place'],
-                    values['Phone No'],
-                    values['Username'],
-                    values['Password']
-                ))
-                connection.commit()
-                
-                messagebox.showinfo("Success", "Registration successful! You can now login.")
-                # Clear all entries
-                for entry in self.register_entries.values():
-                    entry.delete(0, 'end')
-                self.show_login_frame()
-                
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", f"Error during registration: {str(e)}")
-            finally:
-                cursor.close()
-                connection.close()
+        def add_driver():
+            # Check if username already exists
+            if self.storage.find_driver_by_username(values['Username']):
+                return False
+            
+            # Insert new driver
+            self.storage.add_driver(
+                values['Name'],
+                age,
+                values['Gender'],
+                values['License No'],
+                values['Place'],
+                values['Phone No'],
+                values['Username'],
+                values['Password']
+            )
+            return True
+        
+        def registered(added):
+            if not added:
+                messagebox.showerror("Error", "Username already exists")
+                return
+            messagebox.showinfo("Success", "Registration successful! You can now login.")
+            # Clear all entries
+            for entry in self.register_entries.values():
+                entry.delete(0, 'end')
+            self.show_login_frame()
+        
+        self.tasks.submit(add_driver, on_done=registered,
+                          on_error=self._task_error("Error during registration"))
 
     def login(self):
         """Handle driver login"""
@@ -562,27 +667,18 @@ class DriverDrowsinessGUI:
             messagebox.showerror("Error", "Please enter both username and password")
             return
         
-        connection = self.get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("SELECT * FROM drivers WHERE username=%s AND password=%s", 
-                             (username, password))
-                driver = cursor.fetchone()
-                
-                if driver:
-                    self.current_driver = driver
-                    messagebox.showinfo("Success", f"Welcome {driver[1]}!")  # driver[1] is the name
-                    self.username_entry.delete(0, 'end')
-                    self.password_entry.delete(0, 'end')
-                    self.show_main_frame()
-                else:
-                    messagebox.showerror("Error", "Invalid username or password")
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", f"Error during login: {str(e)}")
-            finally:
-                cursor.close()
-                connection.close()
+        def logged_in(driver):
+            if driver:
+                self.current_driver = driver
+                messagebox.showinfo("Success", f"Welcome {driver[1]}!")  # driver[1] is the name
+                self.username_entry.delete(0, 'end')
+                self.password_entry.delete(0, 'end')
+                self.show_main_frame()
+            else:
+                messagebox.showerror("Error", "Invalid username or password")
+        
+        self.tasks.submit(self.storage.find_driver, username, password,
+                          on_done=logged_in, on_error=self._task_error("Error during login"))
 
     def start_journey(self):
         """Start a new journey for the current driver"""
@@ -590,132 +686,216 @@ class DriverDrowsinessGUI:
             messagebox.showerror("Error", "No driver logged in")
             return
         
-        try:
-            model_path = os.path.join(os.path.dirname(__file__), 'drowsiness_model.h5')
-            if not os.path.exists(model_path):
-                messagebox.showerror("Error", "Model file not found")
-                return
-                
-            self.detector = DrowsinessDetector(model_path)
+        if self.model_path is None:
+            messagebox.showerror("Error", "Model file not found")
+            return
+        
+        # Guard against a second click while the journey is being created
+        self.start_button.config(state='disabled')
+        driver_id = self.current_driver[0]
+        
+        def create_journey():
+            from modules.drowsiness_detector import DrowsinessDetector
+            from modules.alarm import AlarmService, create_sink
+            if self.alarm is None:
+                self.alarm = AlarmService(create_sink(self.alarm_sink))
+            detector = DrowsinessDetector(self.model_path, self.backend, alarm=self.alarm)
+            # Create journey record in database
+            return detector, self.storage.start_journey(driver_id, datetime.now())
+        
+        def started(result):
+            self.detector, self.current_journey_id = result
             self.drowsiness_count = 0
             self.journey_active = True
+            self.end_button.config(state='normal')
             
-            # Create journey record in database
-            connection = self.get_db_connection()
-            if connection:
-                cursor = connection.cursor()
+            # Start detection in a separate thread
+            if self.preview is None:
+                from modules.camera_preview import CameraPreview
+                self.preview = CameraPreview(self.root, self.preview_label)
+            self.preview.start()
+            detector = self.detector
+            
+            def detect():
                 try:
-                    cursor.execute("""
-                        INSERT INTO journeys (driver_id, start_time, drowsiness_count, journey_status)
-                        VALUES (%s, %s, %s, %s)
-                    """, (self.current_driver[0], datetime.now(), 0, 'Active'))
-                    connection.commit()
-                    self.current_journey_id = cursor.lastrowid
-                    
-                    # Update UI
-                    self.start_button.config(state='disabled')
-                    self.end_button.config(state='normal')
-                    
-                    # Start detection in a separate thread
-                    self.detection_thread = threading.Thread(
-                        target=self.detector.run_detection,
-                        args=(lambda: self.journey_active, self.update_drowsiness_count)
-                    )
-                    self.detection_thread.start()
-                    
-                except mysql.connector.Error as e:
-                    messagebox.showerror("Database Error", f"Error starting journey: {str(e)}")
+                    detector.run_detection(lambda: self.journey_active, self.update_drowsiness_count,
+                                           self.record_drowsiness_event, self.show_frame, self.detection_error)
                 finally:
-                    cursor.close()
-                    connection.close()
-                    
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to start journey: {str(e)}")
+                    self.tasks.post(self.tasks.unwatch)
+            
+            # Errors from the detection thread reach the Tk thread through tasks.post
+            self.tasks.watch()
+            self.detection_thread = threading.Thread(target=detect)
+            self.detection_thread.start()
+        
+        def failed(e):
+            self.start_button.config(state='normal')
+            self._task_error("Failed to start journey")(e)
+        
+        self.tasks.submit(create_journey, on_done=started, on_error=failed)
 
     def update_drowsiness_count(self):
-        """Update drowsiness count in database"""
+        """Count a drowsiness alert; the database aggregate is written with the event batch"""
         self.drowsiness_count += 1
-        connection = self.get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("""
-                    UPDATE journeys 
-                    SET drowsiness_count = %s 
-                    WHERE id = %s
-                """, (self.drowsiness_count, self.current_journey_id))
-                connection.commit()
-            except mysql.connector.Error as e:
-                print(f"Error updating drowsiness count: {str(e)}")
-            finally:
-                cursor.close()
-                connection.close()
+
+    def show_frame(self, frame, faces, score):
+        """Hand a processed frame to the dashboard preview (detection thread)"""
+        self.preview.submit(frame, faces, score, self.drowsiness_count)
+
+    def detection_error(self, title, message):
+        """Report a detection failure (detection thread) and close the journey on the Tk thread"""
+        self.tasks.post(self._detection_failed, title, message)
+
+    def _detection_failed(self, title, message):
+        if not self.journey_active:
+            return
+        messagebox.showerror(title, message)
+        self._finish_journey(announce=False)
+
+    def record_drowsiness_event(self, event):
+        """Buffer a finished drowsiness event for batched insertion"""
+        self.event_buffer.add(self.current_journey_id, event['start'], event['duration'],
+                              event['closure_ratio'], event['score'])
 
     def end_journey(self):
         """End the current journey"""
         if messagebox.askyesno("Confirm", "Are you sure you want to end this journey?"):
-            self.journey_active = False
-            if hasattr(self, 'detection_thread'):
-                self.detection_thread.join()
-            
-            connection = self.get_db_connection()
-            if connection:
-                cursor = connection.cursor()
-                try:
-                    cursor.execute("""
-                        UPDATE journeys 
-                        SET end_time = %s, journey_status = 'Completed' 
-                        WHERE id = %s
-                    """, (datetime.now(), self.current_journey_id))
-                    connection.commit()
-                    
-                    # Update UI
-                    self.start_button.config(state='normal')
-                    self.end_button.config(state='disabled')
-                    messagebox.showinfo("Success", "Journey ended successfully")
-                    
-                except mysql.connector.Error as e:
-                    messagebox.showerror("Database Error", f"Error ending journey: {str(e)}")
-                finally:
-                    cursor.close()
-                    connection.close()
+            self._finish_journey()
+
+    def _finish_journey(self, announce=True):
+        """Stop detection and close the journey record"""
+        self.journey_active = False
+        self.end_button.config(state='disabled')
+        if self.preview is not None:
+            self.preview.stop()
+        detection_thread = getattr(self, 'detection_thread', None)
+        journey_id = self.current_journey_id
+        
+        def finish_journey():
+            # The detector may take a moment to stop; wait for it off the Tk thread
+            if detection_thread is not None:
+                detection_thread.join()
+            # Make sure buffered drowsiness events land before the journey is closed
+            self.event_buffer.flush()
+            self.db_writer.flush()
+            self.storage.end_journey(journey_id, datetime.now())
+        
+        def ended(_):
+            self.start_button.config(state='normal')
+            if announce:
+                messagebox.showinfo("Success", "Journey ended successfully")
+        
+        def failed(e):
+            # Leave End Journey enabled so closing the record can be retried
+            self.end_button.config(state='normal')
+            self._task_error("Error ending journey")(e)
+        
+        self.tasks.submit(finish_journey, on_done=ended, on_error=failed)
 
     def generate_report(self):
         """Generate report for the current driver"""
         if not hasattr(self, 'current_driver'):
             messagebox.showerror("Error", "No driver logged in")
             return
-            
-        connection = self.get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("""
-                    SELECT start_time, end_time, drowsiness_count, journey_status 
-                    FROM journeys 
-                    WHERE driver_id = %s 
-                    ORDER BY start_time DESC
-                """, (self.current_driver[0],))
-                journeys = cursor.fetchall()
-                
-                if not journeys:
-                    messagebox.showinfo("Report", "No journeys found for this driver")
-                    return
-                
-                report = f"Driver: {self.current_driver[1]}\n\nJourney History:\n"
-                for journey in journeys:
-                    report += f"\nStart: {journey[0]}"
-                    report += f"\nEnd: {journey[1] if journey[1] else 'Ongoing'}"
-                    report += f"\nDrowsiness Events: {journey[2]}"
-                    report += f"\nStatus: {journey[3]}\n"
-                
-                messagebox.showinfo("Journey Report", report)
-                
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", f"Error generating report: {str(e)}")
-            finally:
-                cursor.close()
-                connection.close()
+        self.show_report(f"Journey Report - {self.current_driver[1]}",
+                         f"Driver: {self.current_driver[1]}", self.current_driver[0])
+
+    def show_report(self, title, heading, driver_id=None):
+        """Show a journey report: a summary of every journey and the history a page at a time.
+
+        The summary is computed on a worker from a stream of rows; the window
+        only ever holds the current page of journeys, newest first.
+        """
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("600x700")
+
+        buttons = tk.Frame(window)
+        buttons.pack(side='bottom', fill='x', pady=5)
+        for label, extension in (("Export CSV", '.csv'), ("Export Parquet", '.parquet')):
+            tk.Button(buttons, text=label,
+                     command=lambda extension=extension: self.export_report(extension, driver_id),
+                     bg='#3498DB', fg='white',
+                     activebackground='#2874A6',
+                     activeforeground='white').pack(side='left', padx=5)
+        older = tk.Button(buttons, text="Older", state='disabled',
+                          command=lambda: turn_page(1),
+                          bg='#95A5A6', fg='white',
+                          activebackground='#7F8C8D',
+                          activeforeground='white')
+        older.pack(side='right', padx=5)
+        newer = tk.Button(buttons, text="Newer", state='disabled',
+                          command=lambda: turn_page(-1),
+                          bg='#95A5A6', fg='white',
+                          activebackground='#7F8C8D',
+                          activeforeground='white')
+        newer.pack(side='right', padx=5)
+
+        text = tk.Text(window, wrap='word', font=('Helvetica', 11))
+        scroll = ttk.Scrollbar(window, orient='vertical', command=text.yview)
+        text.configure(yscrollcommand=scroll.set)
+        scroll.pack(side='right', fill='y')
+        text.pack(side='left', fill='both', expand=True)
+
+        text.insert('end', f"{heading}\n\nSummary:\n")
+        text.mark_set('summary', 'end-1c')
+        text.mark_gravity('summary', 'left')
+        text.insert('end', "\nJourney History:\n")
+        text.mark_set('history', 'end-1c')
+        text.mark_gravity('history', 'left')
+
+        # Keyset position of each page visited, so Newer can step back
+        pages = [None]
+        shown = []
+        closed = threading.Event()
+        window.bind('<Destroy>', lambda event: closed.set() if event.widget is window else None)
+
+        def show_page(rows):
+            if closed.is_set():
+                return
+            shown[:] = rows
+            text.delete('history', 'end')
+            for row in rows:
+                text.insert('end', format_journey(row))
+            if not rows:
+                text.insert('end', "\nNo journeys found\n")
+            text.see('history')
+            newer.config(state='normal' if len(pages) > 1 else 'disabled')
+            older.config(state='normal' if len(rows) == REPORT_PAGE_ROWS else 'disabled')
+
+        def load_page():
+            newer.config(state='disabled')
+            older.config(state='disabled')
+            self.tasks.submit(self.storage.list_journeys, pages[-1], REPORT_PAGE_ROWS, driver_id,
+                              on_done=show_page, on_error=self._task_error("Error loading journeys"))
+
+        def turn_page(step):
+            if step > 0:
+                last = shown[-1]
+                pages.append((last[2], last[0]))
+            else:
+                pages.pop()
+            load_page()
+
+        def show_summary(summary):
+            if not closed.is_set():
+                text.insert('summary', summary.as_text() if summary.journeys else "No journeys found\n")
+
+        # Every journey is read on a worker, but only the running summary is kept
+        self.tasks.submit(summarize, self.storage, driver_id, closed,
+                          on_done=show_summary, on_error=self._task_error("Error generating report"))
+        load_page()
+
+    def export_report(self, extension, driver_id=None):
+        """Export journeys for driver_id, or the whole fleet, to a CSV or Parquet file"""
+        path = filedialog.asksaveasfilename(defaultextension=extension,
+                                            filetypes=[(extension[1:].upper(), '*' + extension)])
+        if not path:
+            return
+        self.tasks.submit(EXPORTERS[extension], self.storage, path, driver_id,
+                          on_done=lambda summary: messagebox.showinfo(
+                              "Export", f"Exported {summary.journeys} journeys to {path}"),
+                          on_error=self._task_error("Error exporting report"))
 
     def logout(self):
         """Handle driver logout"""
@@ -736,28 +916,19 @@ class DriverDrowsinessGUI:
             messagebox.showerror("Error", "Please enter both username and password")
             return
         
-        connection = self.get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("SELECT * FROM admins WHERE username=%s AND password=%s", 
-                             (username, password))
-                admin = cursor.fetchone()
-                
-                if admin:
-                    self.current_admin = admin
-                    messagebox.showinfo("Success", "Welcome Admin!")
-                    self.admin_username_entry.delete(0, 'end')
-                    self.admin_password_entry.delete(0, 'end')
-                    self.show_admin_frame()
-                    self.refresh_admin_data()  # Load initial data
-                else:
-                    messagebox.showerror("Error", "Invalid admin credentials")
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", f"Error during admin login: {str(e)}")
-            finally:
-                cursor.close()
-                connection.close()
+        def logged_in(admin):
+            if admin:
+                self.current_admin = admin
+                messagebox.showinfo("Success", "Welcome Admin!")
+                self.admin_username_entry.delete(0, 'end')
+                self.admin_password_entry.delete(0, 'end')
+                self.show_admin_frame()
+                self.refresh_admin_data()  # Load initial data
+            else:
+                messagebox.showerror("Error", "Invalid admin credentials")
+        
+        self.tasks.submit(self.storage.find_admin, username, password,
+                          on_done=logged_in, on_error=self._task_error("Error during admin login"))
 
     def view_database(self):
         """View and manage database records"""
@@ -776,47 +947,52 @@ class DriverDrowsinessGUI:
         # Drivers Statistics
         stats_frame = ttk.Frame(notebook)
         notebook.add(stats_frame, text="Statistics")
-        
-        connection = self.get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                # Get total drivers
-                cursor.execute("SELECT COUNT(*) FROM drivers")
-                total_drivers = cursor.fetchone()[0]
-                
-                # Get total journeys
-                cursor.execute("SELECT COUNT(*) FROM journeys")
-                total_journeys = cursor.fetchone()[0]
-                
-                # Get total drowsiness events
-                cursor.execute("SELECT SUM(drowsiness_count) FROM journeys")
-                total_drowsiness = cursor.fetchone()[0] or 0
-                
-                # Get active journeys
-                cursor.execute("SELECT COUNT(*) FROM journeys WHERE journey_status = 'Active'")
-                active_journeys = cursor.fetchone()[0]
-                
-                # Display statistics
-                stats_text = f"""
-                Database Statistics:
-                
-                Total Drivers: {total_drivers}
-                Total Journeys: {total_journeys}
-                Total Drowsiness Events: {total_drowsiness}
-                Currently Active Journeys: {active_journeys}
-                """
-                
-                stats_label = tk.Label(stats_frame, 
-                                     text=stats_text,
-                                     font=('Helvetica', 14),
-                                     justify=tk.LEFT,
-                                     padx=20,
-                                     pady=20)
-                stats_label.pack(expand=True)
-                
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", f"Error fetching statistics: {str(e)}")
-            finally:
-                cursor.close()
-                connection.close()
\ No newline at end of file
+        stats_label = tk.Label(stats_frame,
+                             text="Loading statistics...",
+                             font=('Helvetica', 14),
+                             justify=tk.LEFT,
+                             padx=20,
+                             pady=20)
+        stats_label.pack(expand=True)
+        
+        def fetch_statistics():
+            return (self.storage.statistics(),
+                    self.storage.driver_statistics(),
+                    self.storage.daily_statistics())
+        
+        def show_statistics(result):
+            if not db_window.winfo_exists():
+                return
+            stats, driver_rows, daily_rows = result
+            
+            # Display statistics
+            stats_text = f"""
+            Database Statistics:
+            
+            Total Drivers: {stats['total_drivers']}
+            Total Journeys: {stats['total_journeys']}
+            Total Drowsiness Events: {stats['total_drowsiness']}
+            Currently Active Journeys: {stats['active_journeys']}
+            Total Driving Hours: {stats['driving_hours']:.1f}
+            Drowsiness Events per Hour: {stats['events_per_hour']:.2f}
+            """
+            stats_label.config(text=stats_text)
+            
+            # Per-driver and per-day rollups from the summary tables
+            rollups = (
+                ("Per Driver", ('ID', 'Name', 'Journeys', 'Drowsiness', 'Hours', 'Events/Hour'), driver_rows),
+                ("Per Day", ('Day', 'Journeys', 'Drowsiness', 'Hours', 'Events/Hour'), daily_rows)
+            )
+            for title, columns, rows in rollups:
+                frame = ttk.Frame(notebook)
+                notebook.add(frame, text=title)
+                tree = ttk.Treeview(frame, columns=columns, show='headings')
+                for col in columns:
+                    tree.heading(col, text=col)
+                    tree.column(col, width=130)
+                for row in rows:
+                    tree.insert('', 'end', values=row)
+                tree.pack(pady=10, padx=10, fill='both', expand=True)
+        
+        self.tasks.submit(fetch_statistics, on_done=show_statistics,
+                          on_error=self._task_error("Error fetching statistics"))
\ No newline at end of file
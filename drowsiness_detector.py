@@ -1,54 +1,382 @@
 import cv2
 import numpy as np
-from keras.models import load_model
-from keras.preprocessing.image import img_to_array
 import threading
-import winsound
-from tkinter import messagebox
+import queue
+import time
+import collections
+from modules.model_registry import ModelRegistry
+from modules.inference_backends import MAX_BATCH
+from modules.face_tracker import FaceTracker
+from modules.frame_scheduler import AdaptiveScheduler, TARGET_HZ, LATENCY_BUDGET
+from modules.eye_state import EyeStateMonitor, DROWSY
+from modules.assets import AssetManager
+
+# Processed frames wanted within one drowsy-length eye closure; bounds frame skipping
+MIN_CLOSURE_SAMPLES = 15
+
+# Classifier output classes, in model output order
+CLASS_NAMES = ('Closed', 'Open')
+
+# Index of the "closed" class in the classifier output
+CLOSED_CLASS = 0
+
+# Fraction of the face box, from the top, that is searched for eyes
+EYE_REGION_HEIGHT = 0.5
+
+# Rows of the pre-allocated eye batch; it only grows if a frame has more eyes.
+# Matches the batch the TFLite backend is allocated for.
+MAX_EYES = MAX_BATCH
+
+# Multiplier from 8-bit pixels to the classifier's [0, 1] input range
+PIXEL_SCALE = np.float32(1.0 / 255.0)
+
+# Shared result for frames without eyes, so they allocate nothing
+NO_SCORES = np.empty((0,), dtype=np.float32)
+NO_SCORES.flags.writeable = False
+
+
+def put_latest(q, item):
+    """Put item on a bounded queue, dropping the oldest entry when full"""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class StageStats:
+    """Thread-safe latency accumulator for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def summary(self):
+        with self._lock:
+            mean = self.total / self.count if self.count else 0.0
+            return {
+                'count': self.count,
+                'mean_ms': mean * 1000.0,
+                'max_ms': self.max * 1000.0,
+                'dropped': self.dropped
+            }
+
 
 class DrowsinessDetector:
-    def __init__(self, model_path):
+    def __init__(self, model_path, backend='keras', tracking=True, redetect_interval=10,
+                 target_hz=TARGET_HZ, latency_budget=LATENCY_BUDGET, eye_state=None, alarm=None, assets=None):
         self.model_path = model_path
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        self.left_eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_lefteye_2splits.xml')
-        self.right_eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_righteye_2splits.xml')
+        self.backend = backend
+        self.tracking = tracking
+        self.scheduler = AdaptiveScheduler(target_hz, latency_budget, MIN_CLOSURE_SAMPLES)
+        self._detection_scale = 1.0
+        # PERCLOS state machine; pass a configured EyeStateMonitor to change thresholds
+        self.eye_state = eye_state or EyeStateMonitor()
+        # AlarmService sounding while drowsy; None runs silently
+        self.alarm = alarm
+        self.alarm_on = False
+        self.episode_start = None
+        self.episode_score_sum = 0.0
+        self.episode_samples = 0
+        self.completed_events = collections.deque()
+        # Cascades are parsed once per process and shared by every detector
+        cascades = (assets or AssetManager.default()).cascades()
+        self.face_cascade = cascades['face']
+        self.left_eye_cascade = cascades['left_eye']
+        self.right_eye_cascade = cascades['right_eye']
+        self.tracker = FaceTracker(self.face_cascade, redetect_interval)
+        self.stats = {name: StageStats(name) for name in ('capture', 'detection', 'alert', 'end_to_end')}
+        # Per-frame working arrays, reused while the frame and model shapes stay the same
+        self._buffers = {}
 
     def start_alarm(self):
-        try:
-            winsound.Beep(1000, 1000)
-        except Exception as e:
-            print(f"Error playing alarm: {str(e)}")
+        if self.alarm is not None:
+            self.alarm.start()
+
+    def stop_alarm(self):
+        if self.alarm is not None:
+            self.alarm.stop()
+
+    def latency_report(self):
+        """Return per-stage latency statistics in milliseconds"""
+        report = {name: stats.summary() for name, stats in self.stats.items()}
+        report['tracking'] = self.tracker.summary()
+        report['scheduler'] = self.scheduler.summary()
+        report['eye_state'] = self.eye_state.summary(time.time())
+        return report
+
+    def _buffer(self, name, shape, dtype):
+        """Return the detector-owned array name, reallocating it only when shape or dtype change"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    @staticmethod
+    def preprocess_eyes(crops, input_shape, out=None, pixels=None):
+        """Stack eye crops into one normalized float32 batch of input_shape.
+
+        With out (at least len(crops) rows of input_shape) the batch is written
+        in place and a view of its first rows is returned; pixels is an
+        optional 8-bit buffer each crop is resized into.
+        """
+        height, width, channels = input_shape
+        batch = np.empty((len(crops), height, width, channels), dtype='float32') if out is None else out[:len(crops)]
+        for i, crop in enumerate(crops):
+            resized = cv2.resize(crop, (width, height), dst=pixels, interpolation=cv2.INTER_AREA)
+            np.multiply(resized.reshape(height, width, channels), PIXEL_SCALE, out=batch[i], dtype=np.float32)
+        return batch
+
+    def batch_eyes(self, crops, input_shape, source):
+        """preprocess_eyes into the detector's eye batch and resize buffers"""
+        height, width, channels = input_shape
+        batch = self._buffers.get('eye_batch')
+        if batch is None or len(batch) < len(crops) or batch.shape[1:] != tuple(input_shape):
+            batch = self._buffers['eye_batch'] = np.empty((max(MAX_EYES, len(crops)), height, width, channels),
+                                                          dtype=np.float32)
+        pixels = self._buffer('eye_pixels', (height, width) + source.shape[2:], source.dtype)
+        return self.preprocess_eyes(crops, input_shape, batch, pixels)
+
+    def classify_eyes(self, model, batch):
+        """Return the closed-eye probability for every crop in batch in one call"""
+        if len(batch) == 0:
+            return NO_SCORES
+        return model.predict(batch)[:, CLOSED_CLASS]
+
+    def detect_faces(self, model, frame, scale=1.0):
+        """Run face/eye cascades and classify every eye in the frame.
+
+        The cascades run on the frame downscaled by scale; eye crops for the
+        classifier are taken from the full-resolution frame. Returns a list of
+        (face_box, eye_boxes, eye_scores) tuples in frame coordinates.
+        """
+        height, width, channels = model.input_shape
+        frame_height, frame_width = frame.shape[:2]
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._buffer('gray', (frame_height, frame_width), np.uint8))
+        source = gray if channels == 1 else frame
+        if scale != self._detection_scale:
+            # Tracked boxes are in detection coordinates and go stale on a scale change
+            self.tracker.reset()
+            self._detection_scale = scale
+        if scale == 1.0:
+            small = gray
+        else:
+            size = (int(round(frame_width * scale)), int(round(frame_height * scale)))
+            small = cv2.resize(gray, size, dst=self._buffer('small', size[::-1], np.uint8),
+                               interpolation=cv2.INTER_AREA)
+        faces = self.tracker.locate(small) if self.tracking else self.tracker.detect(small)
+
+        crops = []
+        face_eyes = []
+        for (x, y, w, h) in faces:
+            # Eyes are only searched for in the upper part of the face
+            roi_gray = small[y:y + int(h * EYE_REGION_HEIGHT), x:x + w]
+            eye_boxes = []
+            for cascade in (self.left_eye_cascade, self.right_eye_cascade):
+                eyes = cascade.detectMultiScale(roi_gray)
+                for (ex, ey, ew, eh) in eyes[:1]:
+                    ex, ey = int((x + ex) / scale), int((y + ey) / scale)
+                    ew, eh = int(ew / scale), int(eh / scale)
+                    eye_boxes.append((ex, ey, ew, eh))
+                    crops.append(source[ey:ey + eh, ex:ex + ew])
+            face_box = (int(x / scale), int(y / scale), int(w / scale), int(h / scale))
+            face_eyes.append((face_box, eye_boxes))
+
+        # Both eyes of every face go through the classifier in a single batch
+        scores = self.classify_eyes(model, self.batch_eyes(crops, (height, width, channels), source))
+
+        results = []
+        offset = 0
+        for face_box, eye_boxes in face_eyes:
+            results.append((face_box, eye_boxes, scores[offset:offset + len(eye_boxes)]))
+            offset += len(eye_boxes)
+        return results
+
+    def detect_frame(self, model, frame, scale=1.0):
+        """Run face/eye cascades and the classifier on one frame.
+
+        Returns the closed-eye score of the driver's most open eye, or None
+        when no eye was found in the frame.
+        """
+        return self.driver_score(self.detect_faces(model, frame, scale))
+
+    @staticmethod
+    def driver_score(results):
+        """Reduce detect_faces() results to the driver's closed-eye score, or None"""
+        results = [r for r in results if len(r[2])]
+        if not results:
+            return None
+        # The driver is the largest face; eyes are only closed if every eye is closed
+        _, _, scores = max(results, key=lambda r: r[0][2] * r[0][3])
+        return float(scores.min())
+
+    def update_state(self, score, timestamp=None):
+        """Feed one frame's closed-eye score; return True when a new alert starts.
+
+        The eye-state monitor moves between alert, warning and drowsy; an
+        alert starts on entering drowsy. When the drowsy state ends its
+        details are appended to completed_events as a dict with start,
+        duration, closure_ratio (PERCLOS) and mean score.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        drowsy = self.eye_state.update(timestamp, score) == DROWSY
+        if not drowsy:
+            self.finish_episode(timestamp)
+            return False
+
+        onset = not self.alarm_on
+        if onset:
+            self.alarm_on = True
+            # The episode began when the eyes closed, not when the threshold was crossed
+            closed_since = self.eye_state.closed_since
+            self.episode_start = closed_since if closed_since is not None else timestamp
+            self.episode_score_sum = 0.0
+            self.episode_samples = 0
+        if score is not None:
+            self.episode_score_sum += score
+            self.episode_samples += 1
+        return onset
+
+    def finish_episode(self, timestamp=None):
+        """Close the current alerted episode, if any, and queue it as an event"""
+        if self.alarm_on:
+            timestamp = time.time() if timestamp is None else timestamp
+            self.completed_events.append({
+                'start': self.episode_start,
+                'duration': timestamp - self.episode_start,
+                'closure_ratio': self.eye_state.perclos,
+                'score': self.episode_score_sum / self.episode_samples if self.episode_samples else 0.0
+            })
+            self.stop_alarm()
+        self.alarm_on = False
+
+    def _capture_loop(self, cap, frame_queue, stop_event):
+        """Capture stage: keep only the newest frame in the queue"""
+        index = 0
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                put_latest(frame_queue, None)
+                break
+            self.stats['capture'].record(time.perf_counter() - start)
+            if frame_queue.full():
+                self.stats['capture'].drop()
+            put_latest(frame_queue, (index, time.perf_counter(), frame))
+            index += 1
+
+    def _alert_loop(self, alert_queue, update_drowsiness_count, stop_event):
+        """Alert stage: count alerts and start the alarm off the detection path"""
+        while not stop_event.is_set():
+            try:
+                captured_at = alert_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            start = time.perf_counter()
+            update_drowsiness_count()
+            self.stats['end_to_end'].record(time.perf_counter() - captured_at)
+            # The episode may already be over, and its stop sent, by the time we get here
+            if self.alarm_on:
+                self.start_alarm()
+            self.stats['alert'].record(time.perf_counter() - start)
+
+    def run_detection(self, journey_active_callback, update_drowsiness_count, record_event=None, on_frame=None,
+                      on_error=None):
+        """Run the capture/detection/alert pipeline until the journey ends.
+
+        on_frame(frame, faces, score), if given, is called from the detection
+        thread after every processed frame, e.g. to feed a CameraPreview.
+        on_error(title, message) is called from the detection thread when the
+        pipeline stops because of an error; without it the error is printed.
+        """
+        def report(title, message):
+            if on_error is not None:
+                on_error(title, message)
+            else:
+                print(f"{title}: {message}")
 
-    def run_detection(self, journey_active_callback, update_drowsiness_count):
         import warnings
         warnings.filterwarnings('ignore')
-        
+
         cap = None
+        stop_event = threading.Event()
+        threads = []
         try:
-            model = load_model(self.model_path, compile=False)
-            model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
-            
+            model = ModelRegistry.get(self.model_path, self.backend)
+
             cap = cv2.VideoCapture(0)
             if not cap.isOpened():
-                messagebox.showerror("Camera Error", "Could not access the camera")
+                report("Camera Error", "Could not access the camera")
                 return
-                
-            frame_counter = 0
-            alarm_on = False
+            # Keep the driver-side buffer as short as the backend allows
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            frame_queue = queue.Queue(maxsize=1)
+            alert_queue = queue.Queue(maxsize=4)
+            threads = [
+                threading.Thread(target=self._capture_loop, args=(cap, frame_queue, stop_event), daemon=True),
+                threading.Thread(target=self._alert_loop, args=(alert_queue, update_drowsiness_count, stop_event), daemon=True)
+            ]
+            for thread in threads:
+                thread.start()
 
             while journey_active_callback():
-                ret, frame = cap.read()
-                if not ret:
-                    messagebox.showerror("Camera Error", "Failed to capture frame")
+                try:
+                    item = frame_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    report("Camera Error", "Failed to capture frame")
                     break
-                    
-                # Your existing detection code here
-                # (The entire content of the while loop from run_drowsiness_detection)
-                # Replace self.drowsiness_count += 1 with update_drowsiness_count()
+                index, captured_at, frame = item
+                if not self.scheduler.should_process(index, captured_at):
+                    continue
+
+                start = time.perf_counter()
+                faces = self.detect_faces(model, frame, self.scheduler.scale)
+                score = self.driver_score(faces)
+                elapsed = time.perf_counter() - start
+                self.stats['detection'].record(elapsed)
+                self.scheduler.record(elapsed)
+
+                if self.update_state(score):
+                    if alert_queue.full():
+                        self.stats['alert'].drop()
+                    put_latest(alert_queue, captured_at)
+                while self.completed_events and record_event is not None:
+                    record_event(self.completed_events.popleft())
+                if on_frame is not None:
+                    on_frame(frame, faces, score)
 
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            report("Error", f"An error occurred: {str(e)}")
         finally:
+            stop_event.set()
+            # An episode still in progress when the journey ends is recorded too
+            self.finish_episode()
+            while self.completed_events and record_event is not None:
+                record_event(self.completed_events.popleft())
+            for thread in threads:
+                thread.join(timeout=2.0)
             if cap is not None and cap.isOpened():
                 cap.release()
-            cv2.destroyAllWindows()
\ No newline at end of file
+            print("Detection latency:", self.latency_report())
\ No newline at end of file
@@ -0,0 +1,150 @@
+import collections
+
+# Sliding window for PERCLOS and the blink rate, in seconds
+PERCLOS_WINDOW = 60.0
+
+# Observed time needed before PERCLOS is trusted, in seconds
+MIN_PERCLOS_TIME = 10.0
+
+# Closed-eye score above which a sample counts as closed
+CLOSED_SCORE = 0.5
+
+# Longest closure counted as a blink rather than a microsleep, in seconds
+BLINK_MAX_DURATION = 0.5
+
+# Longest time credited to one sample, so dropped frames or a stalled
+# pipeline don't stretch a single reading
+MAX_SAMPLE_GAP = 0.5
+
+# Default state machine thresholds: PERCLOS fractions and closure durations in seconds
+WARNING_PERCLOS = 0.15
+DROWSY_PERCLOS = 0.30
+WARNING_CLOSURE = 0.8
+DROWSY_CLOSURE = 1.5
+
+# Time the readings must stay below a state's thresholds before stepping down, in seconds
+RECOVERY_TIME = 2.0
+
+# Driver states, in increasing order of severity
+ALERT = 'alert'
+WARNING = 'warning'
+DROWSY = 'drowsy'
+STATES = (ALERT, WARNING, DROWSY)
+
+
+class EyeStateMonitor:
+    """Time-based eye-state aggregator driving an alert/warning/drowsy state machine.
+
+    Every sample is weighted by the time until the next one, so PERCLOS
+    (fraction of time with eyes closed), blink rate and closure duration
+    mean the same thing at any processing rate. Samples live in a ring
+    buffer covering the last `window` seconds; running sums are updated as
+    samples enter and leave it, so each update is O(1) amortized.
+
+    The state escalates as soon as a threshold is crossed and steps down
+    once the readings have stayed below it for recovery_time seconds.
+    """
+
+    def __init__(self, window=PERCLOS_WINDOW, warning_perclos=WARNING_PERCLOS,
+                 drowsy_perclos=DROWSY_PERCLOS, warning_closure=WARNING_CLOSURE,
+                 drowsy_closure=DROWSY_CLOSURE, recovery_time=RECOVERY_TIME):
+        self.window = window
+        self.warning_perclos = warning_perclos
+        self.drowsy_perclos = drowsy_perclos
+        self.warning_closure = warning_closure
+        self.drowsy_closure = drowsy_closure
+        self.recovery_time = recovery_time
+        self.reset()
+
+    def reset(self):
+        self.state = ALERT
+        self.closed_since = None
+        self._samples = collections.deque()
+        self._blinks = collections.deque()
+        self._observed = 0.0
+        self._closed_time = 0.0
+        self._last = None
+        self._first_timestamp = None
+        self._calm_since = None
+
+    @property
+    def perclos(self):
+        return self._closed_time / self._observed if self._observed > 0 else 0.0
+
+    def closure_duration(self, timestamp):
+        """Seconds the eyes have been closed continuously up to timestamp"""
+        return timestamp - self.closed_since if self.closed_since is not None else 0.0
+
+    def blink_rate(self, timestamp):
+        """Blinks per minute over the window"""
+        if self._first_timestamp is None:
+            return 0.0
+        span = min(self.window, timestamp - self._first_timestamp)
+        return len(self._blinks) * 60.0 / span if span > 0 else 0.0
+
+    def update(self, timestamp, score):
+        """Add one eye score (None when no eye was found) and return the new state"""
+        closed = score is not None and score > CLOSED_SCORE
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+
+        if self._last is not None:
+            # The previous reading holds until this one arrives
+            last_timestamp, last_closed = self._last
+            weight = min(max(timestamp - last_timestamp, 0.0), MAX_SAMPLE_GAP)
+            self._samples.append((last_timestamp, weight, last_closed))
+            self._observed += weight
+            if last_closed:
+                self._closed_time += weight
+        self._last = (timestamp, closed)
+
+        horizon = timestamp - self.window
+        while self._samples and self._samples[0][0] < horizon:
+            _, weight, was_closed = self._samples.popleft()
+            self._observed -= weight
+            if was_closed:
+                self._closed_time -= weight
+        if not self._samples:
+            # Clear rounding drift whenever the window empties
+            self._observed = self._closed_time = 0.0
+        while self._blinks and self._blinks[0] < horizon:
+            self._blinks.popleft()
+
+        if closed and self.closed_since is None:
+            self.closed_since = timestamp
+        elif not closed and self.closed_since is not None:
+            if timestamp - self.closed_since <= BLINK_MAX_DURATION:
+                self._blinks.append(timestamp)
+            self.closed_since = None
+
+        self._advance(timestamp, self._target_state(timestamp))
+        return self.state
+
+    def _target_state(self, timestamp):
+        closure = self.closure_duration(timestamp)
+        perclos = self.perclos if self._observed >= min(MIN_PERCLOS_TIME, self.window) else 0.0
+        if closure >= self.drowsy_closure or perclos >= self.drowsy_perclos:
+            return DROWSY
+        if closure >= self.warning_closure or perclos >= self.warning_perclos:
+            return WARNING
+        return ALERT
+
+    def _advance(self, timestamp, target):
+        current = STATES.index(self.state)
+        wanted = STATES.index(target)
+        if wanted >= current:
+            self.state = target
+            self._calm_since = None
+        elif self._calm_since is None:
+            self._calm_since = timestamp
+        elif timestamp - self._calm_since >= self.recovery_time:
+            self.state = STATES[current - 1]
+            self._calm_since = timestamp if wanted < current - 1 else None
+
+    def summary(self, timestamp):
+        return {
+            'state': self.state,
+            'perclos': self.perclos,
+            'blink_rate': self.blink_rate(timestamp),
+            'closure_duration': self.closure_duration(timestamp)
+        }
@@ -0,0 +1,91 @@
+import threading
+
+# Detection parameters for the full-frame face search
+FACE_SCALE_FACTOR = 1.1
+FACE_MIN_NEIGHBORS = 5
+FACE_MIN_SIZE = (60, 60)
+
+
+class FaceTracker:
+    """Track faces between periodic full-frame cascade detections.
+
+    A full-frame detectMultiScale runs every redetect_interval frames or as
+    soon as tracking is lost. In between, each face is searched for only in
+    a padded ROI around its last box, which is far cheaper than scanning the
+    whole frame.
+    """
+
+    def __init__(self, face_cascade, redetect_interval=10, padding=0.25):
+        self.face_cascade = face_cascade
+        self.redetect_interval = redetect_interval
+        self.padding = padding
+        self.faces = []
+        self.frames_since_detection = 0
+        self.full_detections = 0
+        self.tracked_frames = 0
+        self.tracking_hits = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.faces = []
+        self.frames_since_detection = 0
+
+    def detect(self, gray):
+        """Full-frame face detection"""
+        faces = self.face_cascade.detectMultiScale(gray, scaleFactor=FACE_SCALE_FACTOR,
+                                                   minNeighbors=FACE_MIN_NEIGHBORS, minSize=FACE_MIN_SIZE)
+        with self._lock:
+            self.full_detections += 1
+        self.faces = [tuple(int(v) for v in face) for face in faces]
+        self.frames_since_detection = 0
+        return self.faces
+
+    def _track_one(self, gray, box):
+        """Search for a face only inside a padded ROI around box"""
+        x, y, w, h = box
+        pad_w = int(w * self.padding)
+        pad_h = int(h * self.padding)
+        frame_h, frame_w = gray.shape[:2]
+        x0, y0 = max(0, x - pad_w), max(0, y - pad_h)
+        x1, y1 = min(frame_w, x + w + pad_w), min(frame_h, y + h + pad_h)
+        min_size = (int(w * 0.7), int(h * 0.7))
+        found = self.face_cascade.detectMultiScale(gray[y0:y1, x0:x1], scaleFactor=FACE_SCALE_FACTOR,
+                                                   minNeighbors=FACE_MIN_NEIGHBORS, minSize=min_size)
+        if len(found) == 0:
+            return None
+        fx, fy, fw, fh = max(found, key=lambda f: f[2] * f[3])
+        return (int(x0 + fx), int(y0 + fy), int(fw), int(fh))
+
+    def locate(self, gray):
+        """Return face boxes for this frame, tracking where possible"""
+        if not self.faces or self.frames_since_detection >= self.redetect_interval:
+            return self.detect(gray)
+
+        tracked = []
+        for box in self.faces:
+            face = self._track_one(gray, box)
+            if face is None:
+                break
+            tracked.append(face)
+
+        with self._lock:
+            self.tracked_frames += 1
+            if len(tracked) == len(self.faces):
+                self.tracking_hits += 1
+
+        if len(tracked) != len(self.faces):
+            # Tracking lost: fall back to a full-frame detection right away
+            return self.detect(gray)
+
+        self.faces = tracked
+        self.frames_since_detection += 1
+        return self.faces
+
+    def summary(self):
+        with self._lock:
+            hit_rate = self.tracking_hits / self.tracked_frames if self.tracked_frames else 0.0
+            return {
+                'full_detections': self.full_detections,
+                'tracked_frames': self.tracked_frames,
+                'tracking_hit_rate': hit_rate
+            }
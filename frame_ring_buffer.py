@@ -0,0 +1,188 @@
+import argparse
+import multiprocessing as mp
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+# Header layout (int64): [published frame count, sequence number of slot 0, slot 1, ...]
+WRITING = -1
+
+# Serializes attaches that switch off resource tracker registration (Python < 3.13)
+_ATTACH_LOCK = threading.Lock()
+
+
+class SharedFrameRing:
+    """Fixed-size ring of frame slots in shared memory, exposed as NumPy views.
+
+    The capture side writes frames straight into slot views (cv2.VideoCapture.read
+    accepts them as the output image) and publishes them with a sequence number.
+    Readers look frames up by sequence number and work on the slot in place;
+    is_current() tells them afterwards whether the writer lapped the ring and
+    overwrote the frame while they were using it.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, slots=4, name=None, create=True):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        header_bytes = (slots + 1) * 8
+        size = header_bytes + slots * self.frame_bytes
+        self.shm = self._open(name, create, size)
+        self._owner = create
+        self.header = np.ndarray((slots + 1,), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self.shm.buf, offset=header_bytes)
+        if create:
+            self.header[0] = 0
+            self.header[1:] = WRITING
+
+    @staticmethod
+    def _open(name, create, size):
+        if create:
+            return shared_memory.SharedMemory(name=name, create=True, size=size)
+        # Only the creator may unlink the segment; otherwise the attaching
+        # process's resource tracker would remove it when that process exits
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=name, track=False)
+        # Skip registering rather than unregistering afterwards: spawned
+        # children share the creator's tracker, and unregistering there
+        # would drop the creator's own entry
+        with _ATTACH_LOCK:
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def attach(cls, name, shape, dtype=np.uint8, slots=4):
+        """Attach to a ring created by another process"""
+        return cls(shape, dtype, slots, name=name, create=False)
+
+    # Writer side
+
+    def begin_write(self):
+        """Return (sequence, slot view) for the next frame to be written"""
+        sequence = int(self.header[0])
+        slot = sequence % self.slots
+        self.header[1 + slot] = WRITING
+        return sequence, self.frames[slot]
+
+    def commit(self, sequence):
+        """Publish the frame written by begin_write()"""
+        self.header[1 + sequence % self.slots] = sequence
+        self.header[0] = sequence + 1
+
+    def write(self, frame):
+        """Copy frame into the next slot and publish it"""
+        sequence, view = self.begin_write()
+        np.copyto(view, frame)
+        self.commit(sequence)
+        return sequence
+
+    # Reader side
+
+    def latest_sequence(self):
+        """Sequence number of the newest published frame, or -1 if none"""
+        return int(self.header[0]) - 1
+
+    def get(self, sequence):
+        """Return the slot view holding frame sequence, or None if it was overwritten"""
+        if sequence < 0 or int(self.header[1 + sequence % self.slots]) != sequence:
+            return None
+        return self.frames[sequence % self.slots]
+
+    def latest(self):
+        """Return (sequence, view) of the newest frame, or (-1, None)"""
+        sequence = self.latest_sequence()
+        return sequence, self.get(sequence)
+
+    def is_current(self, sequence):
+        """True if the slot still holds frame sequence (i.e. the reader's view was not overwritten)"""
+        return int(self.header[1 + sequence % self.slots]) == sequence
+
+    def close(self):
+        """Release the mapping; the creator also unlinks the segment, attached rings only detach"""
+        # Drop the views before releasing the mapping
+        self.header = None
+        self.frames = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def _queue_producer(q, shape, count):
+    frame = np.zeros(shape, dtype=np.uint8)
+    for i in range(count):
+        frame[0, 0, 0] = i % 256
+        q.put(frame)
+    q.put(None)
+
+
+def _ring_producer(name, shape, slots, count, consumed):
+    ring = SharedFrameRing.attach(name, shape, slots=slots)
+    frame = np.zeros(shape, dtype=np.uint8)
+    for i in range(count):
+        # Same back-pressure as a bounded Queue: never lap the reader
+        while i - consumed.value >= slots - 1:
+            time.sleep(0)
+        frame[0, 0, 0] = i % 256
+        ring.write(frame)
+    ring.close()
+
+
+def benchmark(count=500, shape=(480, 640, 3), slots=8):
+    """Compare frame throughput of multiprocessing.Queue and SharedFrameRing"""
+    context = mp.get_context('spawn')
+    results = {}
+
+    q = context.Queue(maxsize=slots)
+    producer = context.Process(target=_queue_producer, args=(q, shape, count))
+    producer.start()
+    start = time.perf_counter()
+    received = 0
+    while q.get() is not None:
+        received += 1
+    elapsed = time.perf_counter() - start
+    producer.join()
+    results['queue'] = {'frames': received, 'fps': received / elapsed, 'dropped': count - received}
+
+    ring = SharedFrameRing(shape, slots=slots)
+    consumed = context.Value('q', 0, lock=False)
+    producer = context.Process(target=_ring_producer, args=(ring.name, shape, slots, count, consumed))
+    producer.start()
+    start = time.perf_counter()
+    received = 0
+    while consumed.value < count:
+        if ring.latest_sequence() < consumed.value:
+            if not producer.is_alive() and ring.latest_sequence() < consumed.value:
+                break
+            continue
+        view = ring.get(consumed.value)
+        if view is not None and int(view[0, 0, 0]) == consumed.value % 256 and ring.is_current(consumed.value):
+            received += 1
+        consumed.value += 1
+    elapsed = time.perf_counter() - start
+    producer.join()
+    ring.close()
+    results['shared_memory'] = {'frames': received, 'fps': received / elapsed, 'dropped': count - received}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark shared-memory frame transfer against multiprocessing.Queue")
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--slots', type=int, default=8)
+    args = parser.parse_args()
+
+    for method, result in benchmark(args.frames, (args.height, args.width, 3), args.slots).items():
+        print(f"{method:<14}{result['fps']:>10.1f} FPS  {result['frames']} received, {result['dropped']} dropped")
@@ -0,0 +1,95 @@
+import math
+import threading
+
+# Default processing rate and the time allowed to notice a closed-eye episode
+TARGET_HZ = 10.0
+LATENCY_BUDGET = 1.5
+
+# Bounds and step for the detection downscale factor
+MIN_SCALE = 0.5
+MAX_SCALE = 1.0
+SCALE_STEP = 0.85
+
+# Smoothing factor for the moving averages of frame and processing times
+EWMA_ALPHA = 0.2
+
+
+class AdaptiveScheduler:
+    """Pick a detection downscale factor and frame skip from measured timings.
+
+    The scheduler aims to process frames at target_hz. When processing a
+    frame takes longer than the target period the detection resolution is
+    reduced; when there is headroom the resolution is raised again and
+    surplus camera frames are skipped to save CPU. Skipping never stretches
+    the gap between processed frames beyond max_frame_gap, which is derived
+    from the latency budget for noticing a closed-eye episode.
+    """
+
+    def __init__(self, target_hz=TARGET_HZ, latency_budget=LATENCY_BUDGET, frames_needed=1,
+                 min_scale=MIN_SCALE, max_scale=MAX_SCALE, adjust_every=5):
+        self.target_period = 1.0 / target_hz
+        self.max_frame_gap = latency_budget / max(frames_needed, 1)
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.adjust_every = adjust_every
+        self.scale = max_scale
+        self.skip = 0
+        self.frame_interval = None
+        self.processing_time = None
+        self._last_captured_at = None
+        self._last_index = None
+        self._last_processed_index = None
+        self._since_adjust = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _ewma(current, sample):
+        return sample if current is None else current + EWMA_ALPHA * (sample - current)
+
+    def should_process(self, index, captured_at):
+        """Record a captured frame and decide whether to run detection on it.
+
+        index is the camera frame number; frames dropped before reaching the
+        scheduler leave gaps in it, which are spread over the measured interval.
+        """
+        with self._lock:
+            if self._last_index is not None and index > self._last_index:
+                interval = (captured_at - self._last_captured_at) / (index - self._last_index)
+                if interval > 0:
+                    self.frame_interval = self._ewma(self.frame_interval, interval)
+            self._last_captured_at = captured_at
+            self._last_index = index
+
+            if self._last_processed_index is not None and index - self._last_processed_index <= self.skip:
+                return False
+            self._last_processed_index = index
+            return True
+
+    def record(self, seconds):
+        """Record the processing time of one frame and adapt scale/skip"""
+        with self._lock:
+            self.processing_time = self._ewma(self.processing_time, seconds)
+            self._since_adjust += 1
+            if self._since_adjust < self.adjust_every:
+                return
+            self._since_adjust = 0
+
+            if self.processing_time > self.target_period:
+                self.scale = max(self.min_scale, self.scale * SCALE_STEP)
+            elif self.processing_time < self.target_period * 0.5:
+                self.scale = min(self.max_scale, self.scale / SCALE_STEP)
+
+            if self.frame_interval:
+                period = max(self.target_period, self.processing_time)
+                skip = math.ceil(period / self.frame_interval) - 1
+                max_skip = int(self.max_frame_gap / self.frame_interval) - 1
+                self.skip = max(0, min(skip, max_skip))
+
+    def summary(self):
+        with self._lock:
+            return {
+                'scale': self.scale,
+                'skip': self.skip,
+                'processing_ms': (self.processing_time or 0.0) * 1000.0,
+                'frame_interval_ms': (self.frame_interval or 0.0) * 1000.0
+            }
@@ -0,0 +1,207 @@
+import numpy as np
+
+# Largest batch a TFLite interpreter is allocated for; larger batches run in
+# chunks. Also the detector's MAX_EYES.
+MAX_BATCH = 8
+
+
+class InferenceBackend:
+    """Eye-state classifier interface shared by all runtimes.
+
+    input_shape is the (height, width, channels) of a single eye crop and
+    predict() maps a float32 batch of crops to per-class probabilities.
+    """
+    name = None
+    input_shape = None
+
+    def predict(self, batch):
+        raise NotImplementedError
+
+
+class KerasBackend(InferenceBackend):
+    name = 'keras'
+
+    def __init__(self, model_path):
+        from keras.models import load_model
+        # Inference only: skip compilation, the optimizer state is never used
+        self.model = load_model(model_path, compile=False)
+        self.input_shape = tuple(self.model.input_shape[1:])
+
+    def predict(self, batch):
+        return np.asarray(self.model(batch, training=False))
+
+
+def _tflite_interpreter():
+    """The TFLite Interpreter class from whichever runtime is installed"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            # Removed from TensorFlow in favour of ai-edge-litert
+            from tensorflow.lite import Interpreter
+    return Interpreter
+
+
+class TFLiteBackend(InferenceBackend):
+    name = 'tflite'
+
+    def __init__(self, model_path, num_threads=None):
+        self.model_path = model_path
+        self.num_threads = num_threads
+        # One interpreter per batch size, each allocated once, so frames with
+        # a varying number of eyes neither reallocate nor run padding rows
+        self._interpreters = {}
+        interpreter, input_detail, output_detail = self._interpreter(1)
+        self.input_shape = tuple(int(d) for d in input_detail['shape'][1:])
+        # Fully quantized models take and return int8 tensors
+        self.input_scale, self.input_zero_point = input_detail['quantization']
+        self.output_scale, self.output_zero_point = output_detail['quantization']
+
+    def _interpreter(self, batch_size):
+        entry = self._interpreters.get(batch_size)
+        if entry is None:
+            interpreter = _tflite_interpreter()(model_path=self.model_path, num_threads=self.num_threads)
+            input_detail = interpreter.get_input_details()[0]
+            if int(input_detail['shape'][0]) != batch_size:
+                interpreter.resize_tensor_input(input_detail['index'],
+                                                [batch_size] + [int(d) for d in input_detail['shape'][1:]])
+            interpreter.allocate_tensors()
+            entry = (interpreter, interpreter.get_input_details()[0], interpreter.get_output_details()[0])
+            self._interpreters[batch_size] = entry
+        return entry
+
+    def predict(self, batch):
+        if len(batch) > MAX_BATCH:
+            return np.concatenate([self.predict(batch[start:start + MAX_BATCH])
+                                   for start in range(0, len(batch), MAX_BATCH)])
+        if not len(batch):
+            return np.empty((0, int(self._interpreter(1)[2]['shape'][-1])), dtype=np.float32)
+        interpreter, input_detail, output_detail = self._interpreter(len(batch))
+        if input_detail['dtype'] != np.float32:
+            info = np.iinfo(input_detail['dtype'])
+            batch = np.clip(np.round(batch / self.input_scale + self.input_zero_point), info.min, info.max)
+            batch = batch.astype(input_detail['dtype'])
+        interpreter.set_tensor(input_detail['index'], batch)
+        interpreter.invoke()
+        output = interpreter.get_tensor(output_detail['index'])
+        if output_detail['dtype'] != np.float32:
+            output = (output.astype(np.float32) - self.output_zero_point) * self.output_scale
+        return output
+
+
+class StubBackend(InferenceBackend):
+    """Deterministic stand-in classifier for benchmarks and checks without a model file.
+
+    Dark crops score as closed: the closed probability is one minus the
+    crop's mean intensity.
+    """
+    name = 'stub'
+
+    def __init__(self, model_path=None, input_shape=(24, 24, 1)):
+        self.input_shape = tuple(input_shape)
+        self._output = np.empty((0, 2), dtype=np.float32)
+
+    def predict(self, batch):
+        if len(self._output) != len(batch):
+            self._output = np.empty((len(batch), 2), dtype=np.float32)
+        np.mean(batch.reshape(len(batch), -1), axis=1, out=self._output[:, 1])
+        np.subtract(1.0, self._output[:, 1], out=self._output[:, 0])
+        return self._output
+
+
+BACKENDS = {
+    'keras': KerasBackend,
+    'tflite': TFLiteBackend,
+    'tflite_int8': TFLiteBackend
+}
+
+
+def create_backend(name, model_path):
+    """Instantiate the inference backend registered under name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name}")
+    return BACKENDS[name](model_path)
+
+
+def convert_to_tflite(h5_path, tflite_path):
+    """Convert a Keras .h5 model into a float32 TFLite flatbuffer"""
+    import tensorflow as tf
+    from keras.models import load_model
+
+    model = load_model(h5_path, compile=False)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    with open(tflite_path, 'wb') as f:
+        f.write(converter.convert())
+    return tflite_path
+
+
+def convert_to_tflite_int8(h5_path, tflite_path, calibration_batch):
+    """Convert a Keras .h5 model into a fully INT8-quantized TFLite flatbuffer.
+
+    calibration_batch is a float32 batch of preprocessed eye crops used to
+    estimate activation ranges.
+    """
+    import tensorflow as tf
+    from keras.models import load_model
+
+    def representative_dataset():
+        for sample in calibration_batch:
+            yield [sample[np.newaxis].astype(np.float32)]
+
+    model = load_model(h5_path, compile=False)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    with open(tflite_path, 'wb') as f:
+        f.write(converter.convert())
+    return tflite_path
+
+
+def synthetic_eyes(samples, input_shape, seed=0):
+    """A preprocessed batch of drawn eye crops, alternating open and closed.
+
+    Open eyes are a bright almond with a dark iris, closed eyes a dark lid
+    line, both on noisy skin at slightly varying positions and sizes.
+    """
+    height, width, channels = input_shape
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    batch = np.empty((samples,) + tuple(input_shape), dtype=np.float32)
+    for i in range(samples):
+        cx = width * rng.uniform(0.4, 0.6)
+        cy = height * rng.uniform(0.4, 0.6)
+        rx = width * rng.uniform(0.3, 0.42)
+        ry = height * rng.uniform(0.15, 0.25)
+        crop = rng.normal(rng.uniform(0.5, 0.75), 0.03, (height, width)).astype(np.float32)
+        if i % 2 == 0:
+            crop[((x - cx) / rx) ** 2 + ((y - cy) / ry) ** 2 <= 1.0] = 0.95
+            crop[(x - cx) ** 2 + (y - cy) ** 2 <= (ry * 0.9) ** 2] = 0.1
+        else:
+            crop[(np.abs(y - cy) <= max(height / 24.0, 0.5)) & (np.abs(x - cx) <= rx)] = 0.15
+        batch[i] = np.clip(crop, 0.0, 1.0)[:, :, np.newaxis]
+    return batch
+
+
+def check_parity(reference, candidate, samples=64, atol=1e-4, seed=0, batch=None):
+    """Compare two backends on eye crops.
+
+    batch is a preprocessed batch of real crops; without it, samples drawn
+    crops from synthetic_eyes() are used. Returns the maximum absolute
+    difference between their probabilities and raises AssertionError when
+    it exceeds atol or the predicted classes differ.
+    """
+    if reference.input_shape != candidate.input_shape:
+        raise AssertionError(f"Input shapes differ: {reference.input_shape} != {candidate.input_shape}")
+    if batch is None:
+        batch = synthetic_eyes(samples, reference.input_shape, seed)
+    expected = reference.predict(batch)
+    actual = candidate.predict(batch)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    if max_diff > atol or not np.array_equal(expected.argmax(axis=1), actual.argmax(axis=1)):
+        raise AssertionError(f"Backends disagree: max difference {max_diff:.6f}")
+    return max_diff
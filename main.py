@@ -1,9 +1,40 @@
+import argparse
+import os
 import tkinter as tk
-from driver_gui import DriverDrowsinessGUI
+from modules.driver import DriverDrowsinessGUI
+from modules.model_files import MODEL_FILES
+from modules.storage import STORAGES, SQLITE_PATH, MySQLStorage, SyncService, create_storage
+from modules.assets import AssetManager, default_search_path
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Driver Drowsiness Management System")
+    parser.add_argument('--backend', choices=sorted(MODEL_FILES), default='keras',
+                        help="Inference runtime for the eye-state classifier")
+    parser.add_argument('--storage', choices=sorted(STORAGES), default='mysql',
+                        help="Database backend (sqlite works without a server)")
+    parser.add_argument('--db-path', default=SQLITE_PATH, help="SQLite database file")
+    parser.add_argument('--sync-interval', type=float, default=0,
+                        help="With --storage sqlite, push finished journeys to the central MySQL server every N seconds")
+    parser.add_argument('--pool-size', type=int, default=None,
+                        help="Pooled connections to the MySQL server (default 5)")
+    parser.add_argument('--alarm', choices=('auto', 'audio', 'null'), default='auto',
+                        help="Alarm output; null stays silent, e.g. on headless machines")
+    parser.add_argument('--asset-path', default='',
+                        help="Extra directories searched for the model and cascade files, before the defaults")
+    args = parser.parse_args()
+
+    if args.asset_path:
+        AssetManager.configure(args.asset_path.split(os.pathsep) + default_search_path())
+
+    if args.storage == 'sqlite':
+        storage = create_storage('sqlite', path=args.db_path)
+    else:
+        storage = create_storage(args.storage, pool_size=args.pool_size)
+    if args.storage == 'sqlite' and args.sync_interval > 0:
+        SyncService(storage, lambda: MySQLStorage(pool_size=args.pool_size), args.sync_interval).start()
+
     root = tk.Tk()
-    app = DriverDrowsinessGUI(root)
+    app = DriverDrowsinessGUI(root, backend=args.backend, storage=storage, alarm_sink=args.alarm)
     root.mainloop()
 
 
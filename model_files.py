@@ -0,0 +1,15 @@
+import os
+
+# Default model file for each backend, relative to the application directory.
+# Kept free of numpy and ML imports so the GUI can resolve paths before the first paint.
+MODEL_FILES = {
+    'keras': 'drowsiness_model.h5',
+    'tflite': 'drowsiness_model.tflite',
+    'tflite_int8': 'drowsiness_model_int8.tflite'
+}
+
+
+def default_model_path(name, base_dir=None):
+    """Return the default model file for backend name"""
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, MODEL_FILES[name])
@@ -0,0 +1,50 @@
+import threading
+import numpy as np
+from modules.inference_backends import create_backend
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded, warmed-up classifier backends"""
+    _models = {}
+    _loading = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _load(model_path, backend):
+        model = create_backend(backend, model_path)
+        # Warm-up prediction so the first real frame doesn't pay for graph tracing
+        model.predict(np.zeros((1,) + model.input_shape, dtype='float32'))
+        return model
+
+    @classmethod
+    def get(cls, model_path, backend='keras'):
+        """Return the ready model for model_path, loading it on first use"""
+        key = (backend, model_path)
+        with cls._lock:
+            model = cls._models.get(key)
+            if model is not None:
+                return model
+            event = cls._loading.get(key)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                cls._loading[key] = event
+
+        if not owner:
+            # Another thread is already loading this model
+            event.wait()
+            with cls._lock:
+                model = cls._models.get(key)
+            if model is None:
+                raise RuntimeError(f"Failed to load model: {model_path}")
+            return model
+
+        try:
+            model = cls._load(model_path, backend)
+            with cls._lock:
+                cls._models[key] = model
+            return model
+        finally:
+            with cls._lock:
+                del cls._loading[key]
+            event.set()
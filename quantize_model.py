@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import time
+import cv2
+import numpy as np
+from modules.drowsiness_detector import DrowsinessDetector, CLASS_NAMES
+from modules.inference_backends import KerasBackend, TFLiteBackend, convert_to_tflite_int8
+from modules.model_files import default_model_path
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def load_eye_dataset(directory, input_shape, limit=None):
+    """Load labelled eye crops from one sub-directory per class (Closed/Open)"""
+    crops = []
+    labels = []
+    for label, class_name in enumerate(CLASS_NAMES):
+        class_dir = os.path.join(directory, class_name)
+        if not os.path.isdir(class_dir):
+            continue
+        for filename in sorted(os.listdir(class_dir)):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            flag = cv2.IMREAD_GRAYSCALE if input_shape[2] == 1 else cv2.IMREAD_COLOR
+            image = cv2.imread(os.path.join(class_dir, filename), flag)
+            if image is None:
+                continue
+            crops.append(image)
+            labels.append(label)
+    if not crops:
+        raise ValueError(f"No eye crops found under {directory}")
+
+    order = np.random.default_rng(0).permutation(len(crops))
+    if limit:
+        order = order[:limit]
+    batch = DrowsinessDetector.preprocess_eyes([crops[i] for i in order], input_shape)
+    return batch, np.asarray(labels)[order]
+
+
+def evaluate(backend, batch, labels, batch_size):
+    """Return accuracy and per-batch latency statistics for backend"""
+    backend.predict(batch[:batch_size])
+    predictions = []
+    timings = []
+    for start in range(0, len(batch), batch_size):
+        chunk = batch[start:start + batch_size]
+        t0 = time.perf_counter()
+        predictions.append(backend.predict(chunk).argmax(axis=1))
+        timings.append(time.perf_counter() - t0)
+    predictions = np.concatenate(predictions)
+    timings = np.asarray(timings) * 1000.0
+    return {
+        'accuracy': float(np.mean(predictions == labels)),
+        'batch_latency_mean_ms': float(timings.mean()),
+        'batch_latency_p50_ms': float(np.percentile(timings, 50)),
+        'batch_latency_p99_ms': float(np.percentile(timings, 99))
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize drowsiness_model.h5 to INT8 and report accuracy/latency/size")
+    parser.add_argument('--input', default=default_model_path('keras'), help="Float Keras .h5 model")
+    parser.add_argument('--output', default=default_model_path('tflite_int8'), help="INT8 TFLite model to write")
+    parser.add_argument('--calibration', required=True, help="Directory with Closed/ and Open/ eye crops used for calibration")
+    parser.add_argument('--eval', help="Directory with Closed/ and Open/ eye crops for the report (defaults to --calibration)")
+    parser.add_argument('--calibration-samples', type=int, default=500, help="Maximum number of calibration crops")
+    parser.add_argument('--batch-size', type=int, default=2, help="Batch size used for latency measurement")
+    parser.add_argument('--report', help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    float_backend = KerasBackend(args.input)
+    calibration, _ = load_eye_dataset(args.calibration, float_backend.input_shape, args.calibration_samples)
+    convert_to_tflite_int8(args.input, args.output, calibration)
+    int8_backend = TFLiteBackend(args.output)
+
+    eval_batch, eval_labels = load_eye_dataset(args.eval or args.calibration, float_backend.input_shape)
+    report = {
+        'float': dict(evaluate(float_backend, eval_batch, eval_labels, args.batch_size),
+                      size_bytes=os.path.getsize(args.input)),
+        'int8': dict(evaluate(int8_backend, eval_batch, eval_labels, args.batch_size),
+                     size_bytes=os.path.getsize(args.output)),
+        'samples': int(len(eval_labels)),
+        'batch_size': args.batch_size
+    }
+    report['speedup'] = report['float']['batch_latency_mean_ms'] / max(report['int8']['batch_latency_mean_ms'], 1e-9)
+    report['accuracy_delta'] = report['int8']['accuracy'] - report['float']['accuracy']
+
+    print(f"{'model':<8}{'accuracy':>10}{'mean ms':>10}{'p99 ms':>10}{'size KB':>10}")
+    for name in ('float', 'int8'):
+        row = report[name]
+        print(f"{name:<8}{row['accuracy']:>10.4f}{row['batch_latency_mean_ms']:>10.3f}"
+              f"{row['batch_latency_p99_ms']:>10.3f}{row['size_bytes'] / 1024:>10.1f}")
+    print(f"Speedup: {report['speedup']:.2f}x, accuracy change: {report['accuracy_delta']:+.4f}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
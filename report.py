@@ -0,0 +1,177 @@
+import csv
+
+# Columns written by the CSV and Parquet exports, in iter_journeys row order
+EXPORT_COLUMNS = ('journey_id', 'driver_id', 'start_time', 'end_time', 'drowsiness_count', 'journey_status')
+
+# Journeys fetched per batch when streaming from the database
+EXPORT_BATCH_SIZE = 500
+
+# Fitted change in events per hour over the history, relative to its mean,
+# below which the trend is reported as stable
+TREND_TOLERANCE = 0.25
+
+
+class JourneySummary:
+    """Running summary of a stream of journey rows in constant memory.
+
+    Feed rows from Storage.iter_journeys in start-time order with add();
+    ongoing journeys count towards the journey total but not driving time.
+    The trend is the least-squares slope of events per hour across
+    successive completed journeys, kept as running sums.
+    """
+
+    def __init__(self):
+        self.journeys = 0
+        self.events = 0
+        self.driving_seconds = 0.0
+        self.longest_alert_free = 0.0
+        self._alert_free = 0.0
+        self._n = 0
+        self._sum_x = 0.0
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+        self._sum_xx = 0.0
+
+    def add(self, row):
+        _, _, start_time, end_time, drowsiness_count, _ = row
+        events = drowsiness_count or 0
+        self.journeys += 1
+        self.events += events
+        if end_time is None:
+            return
+        seconds = max((end_time - start_time).total_seconds(), 0.0)
+        self.driving_seconds += seconds
+
+        # Alert-free stretch: driving time across consecutive journeys without events
+        if events:
+            self._alert_free = 0.0
+        else:
+            self._alert_free += seconds
+            self.longest_alert_free = max(self.longest_alert_free, self._alert_free)
+
+        if seconds:
+            x = float(self._n)
+            y = events / (seconds / 3600.0)
+            self._n += 1
+            self._sum_x += x
+            self._sum_y += y
+            self._sum_xy += x * y
+            self._sum_xx += x * x
+
+    @property
+    def events_per_hour(self):
+        return self.events / (self.driving_seconds / 3600.0) if self.driving_seconds else 0.0
+
+    @property
+    def trend_slope(self):
+        denominator = self._n * self._sum_xx - self._sum_x ** 2
+        if self._n < 2 or not denominator:
+            return 0.0
+        return (self._n * self._sum_xy - self._sum_x * self._sum_y) / denominator
+
+    @property
+    def trend_change(self):
+        """Fitted change in events per hour from the first to the last journey"""
+        return self.trend_slope * max(self._n - 1, 0)
+
+    @property
+    def trend(self):
+        mean = self._sum_y / self._n if self._n else 0.0
+        change = self.trend_change
+        if mean and change > TREND_TOLERANCE * mean:
+            return 'Worsening'
+        if mean and change < -TREND_TOLERANCE * mean:
+            return 'Improving'
+        return 'Stable'
+
+    def as_text(self):
+        return (f"Journeys: {self.journeys}\n"
+                f"Drowsiness Events: {self.events}\n"
+                f"Driving Hours: {self.driving_seconds / 3600.0:.2f}\n"
+                f"Events per Hour: {self.events_per_hour:.2f}\n"
+                f"Longest Alert-Free Stretch: {self.longest_alert_free / 3600.0:.2f} h\n"
+                f"Trend: {self.trend} ({self.trend_change:+.2f} events/h over {self._n} journeys)\n")
+
+
+def format_journey(row):
+    """Render one iter_journeys row as a block of report text"""
+    _, _, start_time, end_time, drowsiness_count, status = row
+    return (f"\nStart: {start_time}"
+            f"\nEnd: {end_time if end_time else 'Ongoing'}"
+            f"\nDrowsiness Events: {drowsiness_count}"
+            f"\nStatus: {status}\n")
+
+
+def summarize(storage, driver_id=None, stop=None):
+    """Return the JourneySummary for one driver, or the fleet when driver_id is None.
+
+    Setting the optional stop event ends the scan early with a partial summary.
+    """
+    summary = JourneySummary()
+    rows = storage.iter_journeys(driver_id, EXPORT_BATCH_SIZE)
+    try:
+        for row in rows:
+            if stop is not None and stop.is_set():
+                break
+            summary.add(row)
+    finally:
+        rows.close()
+    return summary
+
+
+def export_csv(storage, path, driver_id=None):
+    """Stream journeys to a CSV file; returns the JourneySummary of the exported rows"""
+    summary = JourneySummary()
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in storage.iter_journeys(driver_id, EXPORT_BATCH_SIZE):
+            summary.add(row)
+            writer.writerow(row)
+    return summary
+
+
+def export_parquet(storage, path, driver_id=None):
+    """Stream journeys to a Parquet file one row group per batch.
+
+    Requires pyarrow; returns the JourneySummary of the exported rows.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires the pyarrow package") from e
+
+    schema = pa.schema([
+        ('journey_id', pa.int64()),
+        ('driver_id', pa.int64()),
+        ('start_time', pa.timestamp('us')),
+        ('end_time', pa.timestamp('us')),
+        ('drowsiness_count', pa.int64()),
+        ('journey_status', pa.string())
+    ])
+    summary = JourneySummary()
+    batch = []
+
+    def write_batch(writer):
+        columns = list(zip(*batch))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema))
+        batch.clear()
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for row in storage.iter_journeys(driver_id, EXPORT_BATCH_SIZE):
+            summary.add(row)
+            batch.append(row)
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                write_batch(writer)
+        if batch:
+            write_batch(writer)
+    return summary
+
+
+# Export function for each file extension offered in the GUI
+EXPORTERS = {
+    '.csv': export_csv,
+    '.parquet': export_parquet
+}
@@ -0,0 +1,100 @@
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules driver.py used to import at the top, loaded up front in --eager runs
+EAGER_MODULES = ('cv2', 'numpy', 'keras.models', 'keras.preprocessing.image')
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def _child(eager, db_path):
+    """Open the login window once and report when it has been painted"""
+    if eager:
+        for name in EAGER_MODULES:
+            importlib.import_module(name)
+    import tkinter as tk
+    from modules.driver import DriverDrowsinessGUI
+    from modules.storage import create_storage
+
+    root = tk.Tk()
+    # Without the asset check (a modal warning when the model is missing) and
+    # the background warm-up, which would load cv2/ML before RSS is sampled
+    DriverDrowsinessGUI(root, storage=create_storage('sqlite', path=db_path), alarm_sink='null', warm_up=False)
+    root.update()
+    print(json.dumps({'peak_rss_mb': _peak_rss_mb()}), flush=True)
+    root.destroy()
+
+
+def measure(eager, runs, db_path):
+    """Start the GUI in fresh interpreters; return per-run (seconds, peak RSS MB)"""
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--db-path', db_path]
+    if eager:
+        command.append('--eager')
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        line = process.stdout.readline()
+        elapsed = time.perf_counter() - start
+        process.wait()
+        if not line:
+            raise RuntimeError("GUI process exited before opening its window")
+        results.append((elapsed, json.loads(line)['peak_rss_mb']))
+    return results
+
+
+def summarize(results):
+    seconds = [r[0] for r in results]
+    rss = [r[1] for r in results if r[1] is not None]
+    return {
+        'runs': len(results),
+        'first_window_s': statistics.median(seconds),
+        'first_window_min_s': min(seconds),
+        'peak_rss_mb': statistics.median(rss) if rss else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure GUI time to first window and peak memory")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', help="Write the results to this file")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true',
+                        help="Only measure with the vision/ML modules imported up front")
+    parser.add_argument('--db-path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.eager, args.db_path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'startup.db')
+        modes = (('eager', True),) if args.eager else (('eager', True), ('lazy', False))
+        report = {}
+        for name, eager in modes:
+            report[name] = summarize(measure(eager, args.runs, db_path))
+            print(f"{name:>5}: first window {report[name]['first_window_s'] * 1000:.0f} ms, "
+                  f"peak RSS {report[name]['peak_rss_mb'] or 0:.1f} MB")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,821 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+# Default location of the embedded database
+SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'drowsiness.db')
+
+# Pragmas applied to every SQLite connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA busy_timeout=5000"
+)
+
+# Secondary indexes on journeys, created by every backend's schema setup
+JOURNEY_INDEXES = {
+    'idx_journeys_start_time': ('start_time', 'id'),
+    'idx_journeys_driver_start': ('driver_id', 'start_time'),
+    'idx_journeys_status': ('journey_status',),
+    'idx_journeys_updated_at': ('updated_at',)
+}
+
+# Rows fetched per page by the paginated list queries
+PAGE_SIZE = 200
+
+# Change queries look this far behind the high-water mark to catch in-flight writes
+CHANGE_OVERLAP = timedelta(seconds=5)
+
+# How long deletions are kept for incremental refreshes to pick them up
+DELETION_RETENTION = timedelta(days=1)
+
+# Counters kept per driver, per day and fleet-wide by the summary tables
+STAT_COLUMNS = ('journeys', 'active_journeys', 'drowsiness_events', 'driving_seconds')
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+
+class StorageError(Exception):
+    """Raised by storage backends for any database failure"""
+
+
+class _Transaction:
+    """Cursor wrapper that adapts %s placeholders to the backend's paramstyle"""
+
+    def __init__(self, storage, cursor):
+        self._storage = storage
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(self._storage.adapt(sql), params)
+        return self
+
+    def executemany(self, sql, rows):
+        self._cursor.executemany(self._storage.adapt(sql), rows)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+
+class Storage:
+    """Drivers, journeys, admins and events on top of a SQL database.
+
+    Queries are written once with %s placeholders; subclasses provide
+    connections, the schema and placeholder adaptation.
+    """
+    name = None
+    driver_errors = ()
+
+    def connect(self):
+        raise NotImplementedError
+
+    def release(self, connection):
+        connection.close()
+
+    def adapt(self, sql):
+        return sql
+
+    def create_schema(self):
+        raise NotImplementedError
+
+    def upsert_increment_sql(self, table, key_column, columns):
+        """SQL inserting a summary row or adding to its counters if it exists"""
+        raise NotImplementedError
+
+    @contextmanager
+    def transaction(self):
+        """Yield a cursor; commit on success, roll back and raise StorageError on failure"""
+        try:
+            connection = self.connect()
+        except self.driver_errors as e:
+            raise StorageError(f"Error connecting to database: {e}") from e
+        cursor = connection.cursor()
+        try:
+            yield _Transaction(self, cursor)
+            connection.commit()
+        except BaseException as e:
+            # Never hand the connection back with the transaction still open
+            connection.rollback()
+            if isinstance(e, self.driver_errors):
+                raise StorageError(str(e)) from e
+            raise
+        finally:
+            try:
+                cursor.close()
+            finally:
+                self.release(connection)
+
+    # Drivers
+
+    def find_driver(self, username, password):
+        with self.transaction() as cursor:
+            return cursor.execute("SELECT * FROM drivers WHERE username=%s AND password=%s",
+                                  (username, password)).fetchone()
+
+    def find_driver_by_username(self, username):
+        with self.transaction() as cursor:
+            return cursor.execute("SELECT * FROM drivers WHERE username = %s", (username,)).fetchone()
+
+    def get_driver(self, driver_id):
+        with self.transaction() as cursor:
+            return cursor.execute("SELECT * FROM drivers WHERE id = %s", (driver_id,)).fetchone()
+
+    def add_driver(self, name, age, gender, license_no, place, phone, username, password):
+        with self.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO drivers (name, age, gender, license_no, place, phone, username, password, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (name, age, gender, license_no, place, phone, username, password, self._now(cursor)))
+            driver_id = cursor.lastrowid
+            self._bump(cursor, 'fleet_stats', 'id', 1, drivers=1)
+            return driver_id
+
+    def list_drivers(self, after_id=None, limit=PAGE_SIZE):
+        """Return one page of drivers ordered by id, starting after after_id"""
+        with self.transaction() as cursor:
+            return cursor.execute("""
+                SELECT id, name, age, gender, license_no, place, phone, username FROM drivers
+                WHERE id > %s ORDER BY id LIMIT %s
+            """, (after_id or 0, limit)).fetchall()
+
+    def delete_driver(self, driver_id):
+        """Delete a driver together with their journeys and events"""
+        with self.transaction() as cursor:
+            now = self._now(cursor)
+            journeys = cursor.execute("""
+                SELECT driver_id, start_time, end_time, drowsiness_count, journey_status
+                FROM journeys WHERE driver_id = %s
+            """, (driver_id,)).fetchall()
+            for journey in journeys:
+                self._bump_journey_counters(cursor, *self._journey_contribution(journey, -1), per_driver=False)
+            cursor.execute("DELETE FROM driver_stats WHERE driver_id = %s", (driver_id,))
+            if cursor.execute("SELECT 1 FROM drivers WHERE id = %s", (driver_id,)).fetchone():
+                self._bump(cursor, 'fleet_stats', 'id', 1, drivers=-1)
+            cursor.execute("""
+                INSERT INTO deleted_rows (table_name, row_id, deleted_at)
+                SELECT 'journeys', id, %s FROM journeys WHERE driver_id = %s
+            """, (now, driver_id))
+            self._log_deletion(cursor, 'drivers', driver_id, now)
+            cursor.execute("""
+                DELETE FROM drowsiness_events
+                WHERE journey_id IN (SELECT id FROM journeys WHERE driver_id = %s)
+            """, (driver_id,))
+            cursor.execute("DELETE FROM journeys WHERE driver_id = %s", (driver_id,))
+            cursor.execute("DELETE FROM drivers WHERE id = %s", (driver_id,))
+
+    # Admins
+
+    def find_admin(self, username, password):
+        with self.transaction() as cursor:
+            return cursor.execute("SELECT * FROM admins WHERE username=%s AND password=%s",
+                                  (username, password)).fetchone()
+
+    # Journeys
+
+    def start_journey(self, driver_id, start_time):
+        with self.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO journeys (driver_id, start_time, drowsiness_count, journey_status, updated_at)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (driver_id, start_time, 0, 'Active', self._now(cursor)))
+            journey_id = cursor.lastrowid
+            self._bump_journey(cursor, driver_id, start_time, journeys=1, active_journeys=1)
+            return journey_id
+
+    def end_journey(self, journey_id, end_time):
+        with self.transaction() as cursor:
+            journey = cursor.execute("SELECT driver_id, start_time, journey_status FROM journeys WHERE id = %s",
+                                     (journey_id,)).fetchone()
+            if journey and journey[2] == 'Active':
+                self._bump_journey(cursor, journey[0], journey[1], active_journeys=-1,
+                                   driving_seconds=(end_time - journey[1]).total_seconds())
+            cursor.execute("""
+                UPDATE journeys
+                SET end_time = %s, journey_status = 'Completed', updated_at = %s
+                WHERE id = %s
+            """, (end_time, self._now(cursor), journey_id))
+
+    def import_journey(self, driver_id, start_time, end_time, drowsiness_count, journey_status, events=()):
+        """Insert a complete journey, e.g. one recorded on another device.
+
+        events are (event_time, duration, closure_ratio, score) rows written
+        in the same transaction; drowsiness_count must already include them.
+        """
+        with self.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO journeys (driver_id, start_time, end_time, drowsiness_count, journey_status, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, (driver_id, start_time, end_time, drowsiness_count, journey_status, self._now(cursor)))
+            journey_id = cursor.lastrowid
+            if events:
+                cursor.executemany("""
+                    INSERT INTO drowsiness_events (journey_id, event_time, duration, eye_closure_ratio, model_score)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, [(journey_id,) + tuple(event) for event in events])
+            self._bump_journey_counters(cursor, *self._journey_contribution(
+                (driver_id, start_time, end_time, drowsiness_count, journey_status), 1))
+            return journey_id
+
+    def list_journeys(self, after=None, limit=PAGE_SIZE, driver_id=None):
+        """Return one page of journeys, newest first, optionally for one driver.
+
+        after is the (start_time, id) of the last row of the previous page;
+        keyset pagination keeps every page an index range scan.
+        """
+        conditions = []
+        params = []
+        if driver_id is not None:
+            conditions.append("j.driver_id = %s")
+            params.append(driver_id)
+        if after is not None:
+            start_time, journey_id = after
+            conditions.append("(j.start_time < %s OR (j.start_time = %s AND j.id < %s))")
+            params.extend((start_time, start_time, journey_id))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.transaction() as cursor:
+            return cursor.execute(f"""
+                SELECT j.id, j.driver_id, j.start_time, j.end_time, j.drowsiness_count, j.journey_status
+                FROM journeys j
+                {where}
+                ORDER BY j.start_time DESC, j.id DESC
+                LIMIT %s
+            """, tuple(params) + (limit,)).fetchall()
+
+    def iter_journeys(self, driver_id=None, batch_size=500):
+        """Stream journeys oldest first, for one driver or the whole fleet.
+
+        Rows are (id, driver_id, start_time, end_time, drowsiness_count,
+        journey_status), fetched batch_size at a time from an unbuffered
+        cursor, so memory use does not grow with the number of journeys.
+        """
+        sql = """
+            SELECT id, driver_id, start_time, end_time, drowsiness_count, journey_status
+            FROM journeys
+        """
+        params = ()
+        if driver_id is not None:
+            sql += " WHERE driver_id = %s"
+            params = (driver_id,)
+        sql += " ORDER BY start_time, id"
+        with self.transaction() as cursor:
+            cursor.execute(sql, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield from rows
+            except GeneratorExit:
+                # Closed early: an unbuffered MySQL cursor must be read to
+                # the end before its connection can be used again
+                while cursor.fetchmany(batch_size):
+                    pass
+                raise
+
+    def delete_journey(self, journey_id):
+        with self.transaction() as cursor:
+            journey = cursor.execute("""
+                SELECT driver_id, start_time, end_time, drowsiness_count, journey_status
+                FROM journeys WHERE id = %s
+            """, (journey_id,)).fetchone()
+            if journey:
+                self._bump_journey_counters(cursor, *self._journey_contribution(journey, -1))
+            self._log_deletion(cursor, 'journeys', journey_id, self._now(cursor))
+            cursor.execute("DELETE FROM drowsiness_events WHERE journey_id = %s", (journey_id,))
+            cursor.execute("DELETE FROM journeys WHERE id = %s", (journey_id,))
+
+    # Events
+
+    def add_events(self, rows):
+        """Insert (journey_id, event_time, duration, closure_ratio, score) rows and bump journey counts"""
+        counts = defaultdict(int)
+        for row in rows:
+            counts[row[0]] += 1
+        with self.transaction() as cursor:
+            cursor.executemany("""
+                INSERT INTO drowsiness_events (journey_id, event_time, duration, eye_closure_ratio, model_score)
+                VALUES (%s, %s, %s, %s, %s)
+            """, rows)
+            now = self._now(cursor)
+            cursor.executemany("""
+                UPDATE journeys SET drowsiness_count = drowsiness_count + %s, updated_at = %s WHERE id = %s
+            """, [(count, now, journey_id) for journey_id, count in counts.items()])
+            for journey_id, count in counts.items():
+                journey = cursor.execute("SELECT driver_id, start_time FROM journeys WHERE id = %s",
+                                         (journey_id,)).fetchone()
+                if journey:
+                    self._bump_journey(cursor, journey[0], journey[1], drowsiness_events=count)
+
+    def journey_events(self, journey_id):
+        with self.transaction() as cursor:
+            return cursor.execute("""
+                SELECT journey_id, event_time, duration, eye_closure_ratio, model_score
+                FROM drowsiness_events WHERE journey_id = %s ORDER BY event_time
+            """, (journey_id,)).fetchall()
+
+    # Incremental refresh
+
+    def _log_deletion(self, cursor, table_name, row_id, now):
+        cursor.execute("DELETE FROM deleted_rows WHERE deleted_at < %s", (now - DELETION_RETENTION,))
+        cursor.execute("INSERT INTO deleted_rows (table_name, row_id, deleted_at) VALUES (%s, %s, %s)",
+                       (table_name, row_id, now))
+
+    def _now(self, cursor):
+        """Timestamp for updated_at and deleted_at; the database clock where it differs from ours"""
+        return datetime.now()
+
+    def current_time(self):
+        """Initial high-water mark for changes_since(), on the same clock as updated_at"""
+        with self.transaction() as cursor:
+            return self._now(cursor)
+
+    def changes_since(self, since):
+        """Return drivers, journeys and deletions changed since the high-water mark since.
+
+        The result also carries the new high-water mark to pass next time.
+        Rows are returned with the same columns as list_drivers/list_journeys.
+        If since is older than the deletion log keeps, 'stale' is set and the
+        caller must reload instead, as deletions may have been missed.
+        """
+        with self.transaction() as cursor:
+            now = self._now(cursor)
+            if since < now - DELETION_RETENTION:
+                return {'drivers': [], 'journeys': [], 'deleted': [], 'high_water_mark': now, 'stale': True}
+            since = since - CHANGE_OVERLAP
+            drivers = cursor.execute("""
+                SELECT id, name, age, gender, license_no, place, phone, username FROM drivers
+                WHERE updated_at >= %s
+            """, (since,)).fetchall()
+            journeys = cursor.execute("""
+                SELECT j.id, j.driver_id, j.start_time, j.end_time, j.drowsiness_count, j.journey_status
+                FROM journeys j WHERE j.updated_at >= %s
+            """, (since,)).fetchall()
+            deleted = cursor.execute("SELECT table_name, row_id FROM deleted_rows WHERE deleted_at >= %s",
+                                     (since,)).fetchall()
+        return {'drivers': drivers, 'journeys': journeys, 'deleted': deleted, 'high_water_mark': now, 'stale': False}
+
+    # Statistics
+
+    def _bump(self, cursor, table, key_column, key, **increments):
+        columns = list(increments)
+        cursor.execute(self.upsert_increment_sql(table, key_column, columns),
+                       (key,) + tuple(increments[column] for column in columns))
+
+    def _bump_journey(self, cursor, driver_id, start_time, per_driver=True, **increments):
+        """Apply counter deltas for one journey to the fleet, driver and day summaries"""
+        self._bump(cursor, 'fleet_stats', 'id', 1, **increments)
+        if per_driver:
+            self._bump(cursor, 'driver_stats', 'driver_id', driver_id, **increments)
+        self._bump(cursor, 'daily_stats', 'day', start_time.date(), **increments)
+
+    @staticmethod
+    def _journey_contribution(journey, sign):
+        """(driver_id, start_time, counters) a journey row adds to the summaries, times sign"""
+        driver_id, start_time, end_time, drowsiness_count, status = journey
+        seconds = (end_time - start_time).total_seconds() if end_time else 0.0
+        counters = {
+            'journeys': sign,
+            'active_journeys': sign if status == 'Active' else 0,
+            'drowsiness_events': sign * (drowsiness_count or 0),
+            'driving_seconds': sign * seconds
+        }
+        return driver_id, start_time, counters
+
+    def _bump_journey_counters(self, cursor, driver_id, start_time, counters, per_driver=True):
+        self._bump_journey(cursor, driver_id, start_time, per_driver, **counters)
+
+    def rebuild_statistics(self):
+        """Recompute every summary table from the base tables"""
+        fleet = dict.fromkeys(STAT_COLUMNS, 0)
+        per_driver = defaultdict(lambda: dict.fromkeys(STAT_COLUMNS, 0))
+        per_day = defaultdict(lambda: dict.fromkeys(STAT_COLUMNS, 0))
+        with self.transaction() as cursor:
+            drivers = cursor.execute("SELECT COUNT(*) FROM drivers").fetchone()[0]
+            journeys = cursor.execute("""
+                SELECT driver_id, start_time, end_time, drowsiness_count, journey_status FROM journeys
+            """).fetchall()
+            for journey in journeys:
+                driver_id, start_time, counters = self._journey_contribution(journey, 1)
+                for target in (fleet, per_driver[driver_id], per_day[start_time.date()]):
+                    for column, value in counters.items():
+                        target[column] += value
+
+            for table in ('fleet_stats', 'driver_stats', 'daily_stats'):
+                cursor.execute(f"DELETE FROM {table}")
+            columns = ', '.join(STAT_COLUMNS)
+            placeholders = ', '.join(['%s'] * len(STAT_COLUMNS))
+            cursor.execute(f"INSERT INTO fleet_stats (id, drivers, {columns}) VALUES (1, %s, {placeholders})",
+                           (drivers,) + tuple(fleet[c] for c in STAT_COLUMNS))
+            cursor.executemany(f"INSERT INTO driver_stats (driver_id, {columns}) VALUES (%s, {placeholders})",
+                               [(key,) + tuple(row[c] for c in STAT_COLUMNS) for key, row in per_driver.items()])
+            cursor.executemany(f"INSERT INTO daily_stats (day, {columns}) VALUES (%s, {placeholders})",
+                               [(key,) + tuple(row[c] for c in STAT_COLUMNS) for key, row in per_day.items()])
+
+    def ensure_statistics(self):
+        """Build the summary tables once for databases that predate them"""
+        with self.transaction() as cursor:
+            ready = cursor.execute("SELECT 1 FROM fleet_stats WHERE id = 1").fetchone()
+        if not ready:
+            self.rebuild_statistics()
+
+    @staticmethod
+    def _events_per_hour(events, seconds):
+        return events / (seconds / 3600.0) if seconds else 0.0
+
+    def statistics(self):
+        """Fleet-wide totals, read from the fleet_stats summary row"""
+        with self.transaction() as cursor:
+            row = cursor.execute("""
+                SELECT drivers, journeys, drowsiness_events, active_journeys, driving_seconds
+                FROM fleet_stats WHERE id = 1
+            """).fetchone() or (0, 0, 0, 0, 0.0)
+        return {
+            'total_drivers': row[0],
+            'total_journeys': row[1],
+            'total_drowsiness': row[2],
+            'active_journeys': row[3],
+            'driving_hours': row[4] / 3600.0,
+            'events_per_hour': self._events_per_hour(row[2], row[4])
+        }
+
+    def driver_statistics(self, after_id=None, limit=PAGE_SIZE):
+        """Per-driver rollup rows: (id, name, journeys, events, driving hours, events per hour)"""
+        with self.transaction() as cursor:
+            rows = cursor.execute("""
+                SELECT d.id, d.name, s.journeys, s.drowsiness_events, s.driving_seconds
+                FROM driver_stats s JOIN drivers d ON d.id = s.driver_id
+                WHERE s.driver_id > %s ORDER BY s.driver_id LIMIT %s
+            """, (after_id or 0, limit)).fetchall()
+        return [(driver_id, name, journeys, events, round(seconds / 3600.0, 2),
+                 round(self._events_per_hour(events, seconds), 2))
+                for driver_id, name, journeys, events, seconds in rows]
+
+    def daily_statistics(self, days=30):
+        """Per-day rollup rows, newest first: (day, journeys, events, driving hours, events per hour)"""
+        with self.transaction() as cursor:
+            rows = cursor.execute("""
+                SELECT day, journeys, drowsiness_events, driving_seconds
+                FROM daily_stats ORDER BY day DESC LIMIT %s
+            """, (days,)).fetchall()
+        return [(day, journeys, events, round(seconds / 3600.0, 2),
+                 round(self._events_per_hour(events, seconds), 2))
+                for day, journeys, events, seconds in rows]
+
+
+class MySQLStorage(Storage):
+    """Central MySQL server, using the DatabaseManager connection pool.
+
+    The schema and its migrations run once per process, on a background
+    thread started with the storage; a connection requested before that
+    finishes waits for it, and a failed attempt is retried on next use.
+    pool_size, if given, sets the size of the shared pool.
+    """
+    name = 'mysql'
+
+    def __init__(self, pool_size=None):
+        import mysql.connector
+        from modules.database import DatabaseManager
+        self.driver_errors = (mysql.connector.Error,)
+        self._manager = DatabaseManager
+        if pool_size is not None:
+            DatabaseManager.configure(pool_size)
+        self._schema_ready = False
+        self._schema_lock = threading.RLock()
+        self._migrating = False
+        threading.Thread(target=self._prepare_schema, daemon=True).start()
+
+    def _prepare_schema(self):
+        try:
+            self._ensure_schema()
+        except self.driver_errors as e:
+            print(f"Error creating database: {str(e)}")
+
+    def _ensure_schema(self):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            # ensure_statistics() connects again from inside create_schema()
+            if self._schema_ready or self._migrating:
+                return
+            self._migrating = True
+            try:
+                self.create_schema()
+                self._schema_ready = True
+            finally:
+                self._migrating = False
+
+    def connect(self):
+        self._ensure_schema()
+        # Pooled connection; close() hands it back to the pool
+        return self._manager.get_connection()
+
+    def _now(self, cursor):
+        # Server time, so clients with skewed clocks agree on change order
+        return cursor.execute("SELECT NOW(6)").fetchone()[0]
+
+    def upsert_increment_sql(self, table, key_column, columns):
+        updates = ', '.join(f"{c} = {c} + VALUES({c})" for c in columns)
+        return (f"INSERT INTO {table} ({key_column}, {', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * (len(columns) + 1))}) ON DUPLICATE KEY UPDATE {updates}")
+
+    def create_schema(self):
+        self._manager.create_database()
+        self.ensure_statistics()
+
+
+class SQLiteStorage(Storage):
+    """Embedded SQLite database in WAL mode for vehicles without a server.
+
+    Each thread keeps its own connection. Journeys carry a synced flag so
+    they can be pushed to the central database later with sync_journeys().
+    """
+    name = 'sqlite'
+    driver_errors = (sqlite3.Error,)
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self.create_schema()
+
+    def connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES, timeout=5.0)
+            for pragma in SQLITE_PRAGMAS:
+                connection.execute(pragma)
+            self._local.connection = connection
+        return connection
+
+    def release(self, connection):
+        # Connections are reused per thread
+        pass
+
+    def adapt(self, sql):
+        return sql.replace('%s', '?')
+
+    def upsert_increment_sql(self, table, key_column, columns):
+        updates = ', '.join(f"{c} = {c} + excluded.{c}" for c in columns)
+        return (f"INSERT INTO {table} ({key_column}, {', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * (len(columns) + 1))}) ON CONFLICT({key_column}) DO UPDATE SET {updates}")
+
+    def create_schema(self):
+        with self.transaction() as cursor:
+            cursor.execute('''CREATE TABLE IF NOT EXISTS drivers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                age INTEGER,
+                gender TEXT,
+                license_no TEXT,
+                place TEXT,
+                phone TEXT,
+                username TEXT UNIQUE,
+                password TEXT,
+                updated_at DATETIME
+            )''')
+            cursor.execute('''CREATE TABLE IF NOT EXISTS journeys (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                driver_id INTEGER REFERENCES drivers(id),
+                start_time DATETIME,
+                end_time DATETIME,
+                drowsiness_count INTEGER,
+                journey_status TEXT,
+                synced INTEGER NOT NULL DEFAULT 0,
+                updated_at DATETIME
+            )''')
+            # Databases created before incremental refresh lack updated_at
+            for table in ('drivers', 'journeys'):
+                columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+                if 'updated_at' not in columns:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME")
+            cursor.execute('''CREATE TABLE IF NOT EXISTS drowsiness_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                journey_id INTEGER NOT NULL REFERENCES journeys(id) ON DELETE CASCADE,
+                event_time DATETIME,
+                duration REAL,
+                eye_closure_ratio REAL,
+                model_score REAL
+            )''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_journey_time ON drowsiness_events (journey_id, event_time)")
+            for index_name, columns in JOURNEY_INDEXES.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON journeys ({', '.join(columns)})")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_drivers_updated_at ON drivers (updated_at)")
+            cursor.execute('''CREATE TABLE IF NOT EXISTS deleted_rows (
+                table_name TEXT,
+                row_id INTEGER,
+                deleted_at DATETIME
+            )''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_rows_time ON deleted_rows (deleted_at)")
+            # Summary tables maintained incrementally by every write
+            counters = ''.join(f", {c} {'REAL' if c == 'driving_seconds' else 'INTEGER'} NOT NULL DEFAULT 0"
+                               for c in STAT_COLUMNS)
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS fleet_stats (id INTEGER PRIMARY KEY, drivers INTEGER NOT NULL DEFAULT 0{counters})")
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS driver_stats (driver_id INTEGER PRIMARY KEY{counters})")
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS daily_stats (day DATE PRIMARY KEY{counters})")
+            cursor.execute('''CREATE TABLE IF NOT EXISTS admins (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE,
+                password TEXT
+            )''')
+            cursor.execute("INSERT OR IGNORE INTO admins (username, password) VALUES ('admin', 'admin123')")
+        self.ensure_statistics()
+
+    def unsynced_journeys(self):
+        """Completed journeys not yet pushed to the central database"""
+        with self.transaction() as cursor:
+            return cursor.execute("""
+                SELECT id, driver_id, start_time, end_time, drowsiness_count, journey_status
+                FROM journeys WHERE synced = 0 AND journey_status = 'Completed'
+            """).fetchall()
+
+    def mark_synced(self, journey_ids):
+        with self.transaction() as cursor:
+            cursor.executemany("UPDATE journeys SET synced = 1 WHERE id = %s", [(i,) for i in journey_ids])
+
+
+STORAGES = {
+    'mysql': MySQLStorage,
+    'sqlite': SQLiteStorage
+}
+
+
+def create_storage(name, **kwargs):
+    """Instantiate the storage backend registered under name"""
+    if name not in STORAGES:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return STORAGES[name](**kwargs)
+
+
+def sync_journeys(local, remote):
+    """Push completed, unsynced journeys and their events from local to remote.
+
+    Drivers are matched by username and created on the remote side if
+    needed. Each journey is written with its events in one remote
+    transaction and marked synced straight after, so a failure part way
+    through never pushes the same journey twice. Returns the number of
+    journeys synced.
+    """
+    journeys = local.unsynced_journeys()
+    driver_ids = {}
+    synced = 0
+    for journey_id, driver_id, start_time, end_time, drowsiness_count, status in journeys:
+        if driver_id not in driver_ids:
+            driver = local.get_driver(driver_id)
+            if driver is None:
+                continue
+            remote_driver = remote.find_driver_by_username(driver[7])
+            driver_ids[driver_id] = remote_driver[0] if remote_driver else remote.add_driver(*driver[1:9])
+        events = local.journey_events(journey_id)
+        remote.import_journey(driver_ids[driver_id], start_time, end_time, drowsiness_count, status,
+                              [tuple(event[1:]) for event in events])
+        local.mark_synced([journey_id])
+        synced += 1
+    return synced
+
+
+class SyncService:
+    """Periodically sync a local SQLite store to the central database.
+
+    Connection failures are expected while the vehicle is offline and are
+    simply retried on the next interval.
+    """
+
+    def __init__(self, local, remote_factory, interval=60.0):
+        self.local = local
+        self.remote_factory = remote_factory
+        self.interval = interval
+        self._remote = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def sync_now(self):
+        if self._remote is None:
+            self._remote = self.remote_factory()
+        return sync_journeys(self.local, self._remote)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                count = self.sync_now()
+                if count:
+                    print(f"Synced {count} journeys to the central database")
+            except Exception as e:
+                print(f"Journey sync deferred: {str(e)}")
+
+
+class WriteBehindQueue:
+    """Background writer so callers never wait on the database.
+
+    Submitted calls (usually storage methods) run in order on a daemon thread.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args):
+        self._queue.put((func, args))
+
+    def flush(self):
+        """Block until every call submitted so far has run"""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                func, args = item
+                func(*args)
+            except Exception as e:
+                print(f"Error in background database write: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+
+class EventBuffer:
+    """Buffer drowsiness events and write them in batches.
+
+    Events are flushed as one storage.add_events() call, a single
+    executemany(), once max_events are buffered or the oldest buffered event
+    is max_age seconds old. The same transaction bumps
+    journeys.drowsiness_count once per journey.
+    """
+
+    def __init__(self, writer, storage, max_events=50, max_age=5.0):
+        self.writer = writer
+        self.storage = storage
+        self.max_events = max_events
+        self.max_age = max_age
+        self._rows = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, journey_id, event_time, duration, closure_ratio, score):
+        if not isinstance(event_time, datetime):
+            event_time = datetime.fromtimestamp(event_time)
+        with self._lock:
+            self._rows.append((journey_id, event_time, float(duration), float(closure_ratio), float(score)))
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._rows) >= self.max_events
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Hand buffered events to the background writer"""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._oldest = None
+        if rows:
+            self.writer.submit(self.storage.add_events, rows)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(min(self.max_age, 1.0)):
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.max_age
+            if due:
+                self.flush()
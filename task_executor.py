@@ -0,0 +1,94 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Worker threads; kept below the MySQL pool size so the background writer
+# always has a connection left
+TASK_WORKERS = 3
+
+# Milliseconds between checks for finished tasks while any are pending
+POLL_INTERVAL = 20
+
+
+class TaskExecutor:
+    """Run blocking work on a thread pool and deliver results on the Tk thread.
+
+    submit() must be called from the Tk thread. Workers never touch widgets:
+    completions, and callbacks handed to post() from a worker, are queued
+    and run by a root.after poll that is only active while tasks are pending
+    or a long-running thread has been registered with watch().
+    """
+
+    def __init__(self, root, workers=TASK_WORKERS):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gui-task')
+        self._completed = queue.Queue()
+        self._pending = 0
+        self._watchers = 0
+        self._polling = False
+
+    def submit(self, func, *args, on_done=None, on_error=None):
+        """Run func(*args) on a worker.
+
+        on_done(result) or on_error(exception) is then called on the Tk thread;
+        errors without an on_error handler are printed.
+        """
+        future = self._pool.submit(func, *args)
+        self._pending += 1
+        if self._pending == 1:
+            self.root.config(cursor='watch')
+        future.add_done_callback(lambda f: self._completed.put((self._finish, (f, on_done, on_error))))
+        self._start_polling()
+        return future
+
+    def post(self, callback, *args):
+        """Schedule callback(*args) on the Tk thread from a running task or watched thread"""
+        self._completed.put((callback, args))
+
+    def watch(self):
+        """Keep delivering post() callbacks for a thread not started with submit().
+
+        Call from the Tk thread before starting the thread; the thread should
+        post(unwatch) as its last action.
+        """
+        self._watchers += 1
+        self._start_polling()
+
+    def unwatch(self):
+        self._watchers -= 1
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL, self._poll)
+
+    def _finish(self, future, on_done, on_error):
+        self._pending -= 1
+        if not self._pending:
+            self.root.config(cursor='')
+        error = future.exception()
+        if error is None:
+            if on_done is not None:
+                on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"Error in background task: {str(error)}")
+
+    def _poll(self):
+        while True:
+            try:
+                callback, args = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in task callback: {str(e)}")
+
+        if self._pending or self._watchers:
+            self.root.after(POLL_INTERVAL, self._poll)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
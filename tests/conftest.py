@@ -0,0 +1,11 @@
+import os
+import sys
+import types
+
+# The application imports its own files as the 'modules' package; map it to
+# the repository root so the tests run from a plain checkout
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if 'modules' not in sys.modules:
+    package = types.ModuleType('modules')
+    package.__path__ = [ROOT]
+    sys.modules['modules'] = package
@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip('cv2')
+
+from modules.allocation_check import ALLOCATION_BOUND, measure_allocations
+from modules.detection_benchmark import synthetic_frame
+from modules.drowsiness_detector import DrowsinessDetector
+from modules.inference_backends import StubBackend
+
+
+def test_steady_state_allocations_stay_bounded():
+    model = StubBackend()
+    detector = DrowsinessDetector(None, backend='stub', tracking=False)
+    frame, eye_boxes = synthetic_frame()
+    peaks = measure_allocations(detector, model, frame, eye_boxes, frames=50)
+    assert len(peaks) == 50
+    assert max(peaks) <= ALLOCATION_BOUND
@@ -0,0 +1,28 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('cv2')
+
+from modules.detection_benchmark import FIXTURE_CLIP, compare, recorded_clip, run_benchmark
+from modules.inference_backends import StubBackend
+
+
+def test_synthetic_recording_exercises_every_stage():
+    frames, eye_boxes = recorded_clip(FIXTURE_CLIP)
+    assert eye_boxes is not None and len(eye_boxes) == len(frames)
+    result = run_benchmark(frames, StubBackend(), tracking=False, warmup=2, eye_boxes=eye_boxes)
+    assert result['faces_per_frame'] >= 0.9
+    for stage in ('face_cascade_ms', 'eye_cascade_ms', 'preprocess_ms', 'classifier_ms'):
+        assert result[stage] > 0.0
+
+
+def test_frames_without_faces_are_rejected():
+    frames = [np.zeros((240, 320, 3), dtype=np.uint8)] * 5
+    with pytest.raises(RuntimeError):
+        run_benchmark(frames, StubBackend(), warmup=0)
+
+
+def test_stage_missing_from_baseline_is_a_regression():
+    baseline = {'clip': {'fps': 100.0, 'classifier_ms': 0.0}}
+    results = {'clip': {'fps': 100.0, 'classifier_ms': 0.5}}
+    assert [row[1] for row in compare(results, baseline)] == ['classifier_ms']
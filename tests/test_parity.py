@@ -0,0 +1,43 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('tensorflow')
+keras = pytest.importorskip('keras')
+
+from modules.inference_backends import (MAX_BATCH, KerasBackend, TFLiteBackend, check_parity,
+                                        convert_to_tflite, synthetic_eyes)
+
+
+@pytest.fixture(scope='module')
+def backends(tmp_path_factory):
+    """A small eye-crop classifier saved as .h5 and converted to TFLite"""
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input((24, 24, 1)),
+        keras.layers.Conv2D(8, 3, activation='relu'),
+        keras.layers.MaxPooling2D(),
+        keras.layers.Flatten(),
+        keras.layers.Dense(2, activation='softmax')
+    ])
+    directory = tmp_path_factory.mktemp('models')
+    h5_path = str(directory / 'eyes.h5')
+    tflite_path = str(directory / 'eyes.tflite')
+    model.save(h5_path)
+    convert_to_tflite(h5_path, tflite_path)
+    try:
+        candidate = TFLiteBackend(tflite_path)
+    except ImportError:
+        pytest.skip("no TFLite interpreter installed")
+    return KerasBackend(h5_path), candidate
+
+
+def test_tflite_matches_keras_on_eye_crops(backends):
+    reference, candidate = backends
+    assert check_parity(reference, candidate, samples=64) <= 1e-4
+
+
+@pytest.mark.parametrize('count', [1, 3, MAX_BATCH, MAX_BATCH + 3])
+def test_tflite_handles_any_batch_size(backends, count):
+    reference, candidate = backends
+    batch = synthetic_eyes(count, reference.input_shape, seed=count)
+    np.testing.assert_allclose(candidate.predict(batch), reference.predict(batch), atol=1e-4)